@@ -16,8 +16,12 @@ starts the game.
 """
 
 
+# process start time for the startup report
+import time
+start_time = time.perf_counter()
+
 from game_loop import GameLoop
 
 if __name__ == "__main__":
-    game = GameLoop()
+    game = GameLoop(start_time)
     game.run()
@@ -5,14 +5,15 @@ The background class is responsible for drawing the background of the game.
 It is shared by the game play and main menu screens.
 It contains the background wallpaper, pharaoh, torches, and the exit button.
 The background is drawn on the screen using the draw method.
-The update method is used to check for events and update the game state.
+The update method is used to load the wallpaper when it changes.
+The exit button is hit tested by the screen that shows the background.
 The change_wallpaper method is used to change the background image randomly.
 The create_exit_button method is used to create the exit button.
 The draw method is used to draw the background on the screen.
 
 """
 import pygame
-from pygame_lib import Button, Utils, Sprite, Color
+from pygame_lib import Button, Utils, Sprite, Color, DirtyTracker, AssetPreloader, RenderQueue
 from pharaoh import Pharaoh
 
 
@@ -25,7 +26,6 @@ class Background:
         # graphics are sized for 800 width screen
         # self.settings.screen_scale = self.screen.get_width() // 800
 
-        self.game_exit = False
         self.default_font = settings.default_font
         self.screen_mode = settings.screen_mode
         self.fps = settings.fps
@@ -53,6 +53,7 @@ class Background:
         self.flame2 = Sprite(self.screen, torch_path, (59.2,124), 3, self.settings.screen_scale_y)
 
         self.game_background = None
+        self.dirty = DirtyTracker()
 
         # save random background in settings so other screens can use it
         if self.settings.game_background is None:
@@ -60,22 +61,22 @@ class Background:
 
 
     def change_wallpaper(self):
-        self.settings.game_background = Utils.get_random_file_from_path(self.settings.get_imagePath("background"),True)
+        # the next wallpaper is picked in advance and decoded in the background
+        if self.settings.next_game_background is not None:
+            self.settings.game_background = self.settings.next_game_background
+        else:
+            self.settings.game_background = self.settings.get_imagePath(Utils.get_random_file_from_path(self.settings.get_imagePath("background"),True))
+
+        self.settings.next_game_background = self.settings.get_imagePath(Utils.get_random_file_from_path(self.settings.get_imagePath("background"),True))
+        AssetPreloader.request_image(self.settings.next_game_background)
 
     def update(self, events):
         # change game_background if changed in settings
         if self.game_background != self.settings.game_background:
-            self.wall_art = Utils.load_image_to_fixed_width(self.settings.game_background, self.screen.get_width(), True)
+            # wallpapers are opaque, so the render queue can skip clearing the screen
+            self.wall_art = Utils.load_image_to_fixed_width(self.settings.game_background, self.screen.get_width())
             self.game_background = self.settings.game_background
 
-
-        for event in events:
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if self.exit_button.is_clicked(event.pos):
-                    self.game_exit = True
-
-        return self.game_exit
-
     def create_exit_button(self):
         return Button(self.screen, "X",
                        self.screen.get_width()-(15 * self.settings.screen_scale_x),
@@ -91,7 +92,8 @@ class Background:
 
 
     def draw(self):
-        self.screen.blit(self.wall_art, (0,0))
+        rect = RenderQueue.submit(self.screen, self.wall_art, (0,0), RenderQueue.LAYER_BACKGROUND)
+        self.dirty.update(rect, self.game_background)
         self.pharaoh1.draw()
         self.pharaoh2.draw()
 
@@ -0,0 +1,132 @@
+"""
+Benchmark
+---------
+Runs the game screens headless (SDL dummy video and audio drivers) and
+measures how long update() and draw() take per frame at different screen
+resolutions. The frame rate is not capped, every frame runs as fast as it can.
+The game clock is virtual and moves a fixed step per frame, so the screens
+animate as they do at the normal frame rate (the computer pulses its sequence
+in game play) no matter how fast the frames run.
+
+Each screen (splash, main menu, game play, secret chamber) is driven for a
+fixed number of frames without any player input. The results are printed as
+mean, p50, p95 and p99 milliseconds per frame.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --frames 600 --resolutions 800x480 1920x1080 --screens game_play
+    python benchmark.py --step-ms 33.3 --screens game_play
+
+"""
+# system libraries
+import os
+import sys
+import argparse
+
+# use the dummy drivers so no window or sound device is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+# settings shared by all game screens
+from settings import Settings
+from game_loop import GameLoop
+from pygame_lib import GameClock, AssetRegistry, FontCache, RenderQueue, Allocations
+
+
+resolutions = ["800x480", "1280x720", "1920x1080", "3840x2160"]
+
+# game screens registered in the game loop
+screens = ["splash", "main_menu", "game_play", "secret_chamber"]
+
+
+def percentile(sorted_values, percent):
+    # nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(times):
+    times = sorted(times)
+    mean = sum(times) / len(times) if times else 0.0
+    return mean, percentile(times, 50), percentile(times, 95), percentile(times, 99)
+
+
+def run_screen(game, screen, frames, warmup, step_ms):
+    update_times = []
+    draw_times = []
+    blit_counts = []
+    culled_counts = []
+    allocation_counts = []
+
+    game.current_screen = screen
+    for frame in range(warmup + frames):
+        GameClock.advance(step_ms)
+        # same frame as the game loop, the next screen returned by update
+        # is ignored, the benchmark keeps driving the same screen
+        game.run_frame(pygame.event.get(), keep_screen=True)
+
+        if frame >= warmup:
+            update_times.append(game.update_ms)
+            draw_times.append(game.draw_ms)
+            blit_counts.append(RenderQueue.blit_count)
+            culled_counts.append(RenderQueue.culled_count)
+            allocation_counts.append(Allocations.last_frame)
+
+    return update_times, draw_times, blit_counts, culled_counts, allocation_counts
+
+
+def run(frames, warmup, resolution_list, screen_list, step_ms):
+    results = []
+    for resolution in resolution_list:
+        width, height = (int(value) for value in resolution.lower().split("x"))
+        Settings.screen_mode = "window"
+        Settings.screen_size = (width, height)
+        # load the splash image right away instead of in the background
+        Settings.progressive_startup = False
+
+        game = GameLoop()
+        # time only moves by step_ms per frame
+        GameClock.configure(virtual=True)
+        GameClock.tick()
+        for screen_name in screen_list:
+            screen = game.get_screen(screen_name)
+            update_times, draw_times, blit_counts, culled_counts, allocation_counts = run_screen(game, screen, frames, warmup, step_ms)
+            results.append((resolution, screen_name, update_times, draw_times))
+            print_result(*results[-1])
+            print(f"{resolution:<11}{screen_name:<16}blits   {sum(blit_counts) / max(1, len(blit_counts)):8.1f} per frame, "
+                  f"{sum(culled_counts) / max(1, len(culled_counts)):.1f} culled, "
+                  f"{sum(allocation_counts) / max(1, len(allocation_counts)):.1f} surfaces created")
+        print(f"{resolution:<11}{AssetRegistry.get_report()}")
+        print(f"{resolution:<11}{FontCache.get_report()}")
+
+    pygame.quit()
+    return results
+
+
+def print_header():
+    print(f"{'resolution':<11}{'screen':<16}{'phase':<8}{'mean':>8}{'p50':>8}{'p95':>8}{'p99':>8}   (ms per frame)")
+
+
+def print_result(resolution, screen_name, update_times, draw_times):
+    frame_times = [u + d for u, d in zip(update_times, draw_times)]
+    for phase, times in (("update", update_times), ("draw", draw_times), ("frame", frame_times)):
+        mean, p50, p95, p99 = summarize(times)
+        print(f"{resolution:<11}{screen_name:<16}{phase:<8}{mean:8.2f}{p50:8.2f}{p95:8.2f}{p99:8.2f}")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless frame time benchmark for the game screens")
+    parser.add_argument("--frames", type=int, default=300, help="frames measured per screen")
+    parser.add_argument("--warmup", type=int, default=30, help="frames run before measuring")
+    parser.add_argument("--resolutions", nargs="+", default=resolutions, help="list of WIDTHxHEIGHT")
+    parser.add_argument("--screens", nargs="+", default=screens, choices=screens)
+    parser.add_argument("--step-ms", type=float, default=1000 / 60, help="game time per frame in ms")
+    args = parser.parse_args()
+
+    print_header()
+    run(args.frames, args.warmup, args.resolutions, args.screens, args.step_ms)
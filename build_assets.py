@@ -0,0 +1,155 @@
+"""
+Build Assets
+------------
+Offline tool that creates optimized copies of the game images for each screen
+size the game is deployed on. The source images are much larger than any
+screen needs, so decoding and scaling them at startup is slow on small devices.
+
+Each image is smoothscaled to the largest size the game draws it at on that
+screen, and saved as jpg (opaque images) or png (images with transparency).
+The images are processed by a pool of processes using all cores.
+
+The built images go to images/built/<width>x<height>/ and are listed in
+images/built/manifest.json. At runtime Settings.get_imagePath picks the
+variant for the screen size, the same way the game board picks a pattern
+board by board height. Images that were changed after the build are loaded
+from the source again.
+
+Usage:
+    python build_assets.py
+    python build_assets.py --resolutions 800x480 1920x1080 --workers 2
+
+"""
+# system libraries
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+# settings shared by all game screens
+from settings import Settings
+
+
+resolutions = ["800x480", "1280x720", "1920x1080", "3840x2160"]
+
+# folders to build and how the game sizes their images on a 800x480 screen
+#   width:  scaled to a fixed width,  value is the width on a 800x480 screen
+#   height: scaled to a fixed height, value is the height on a 800x480 screen
+folders = {"background": ("width", 800),
+           "splash":     ("width", 800),
+           "chamber/0":  ("height", 380),
+           "chamber/1":  ("height", 380),
+           "chamber/2":  ("height", 380),
+           "gameplay":   ("height", 440)}
+
+# images in a folder that are sized differently
+images = {"gameplay/pharao1.png": ("width", 120)}
+
+# the torch spritesheet is cut into frames using its source pixel size
+skipped_images = ["gameplay/torch_sprite.png"]
+
+image_extensions = (".jpg", ".jpeg", ".png")
+
+
+def get_target_size(image_size, rule, screen_size):
+    mode, size_800x480 = rule
+    width, height = image_size
+    if mode == "width":
+        target_width = screen_size[0] * size_800x480 // 800
+        return target_width, height * target_width // width
+    target_height = screen_size[1] * size_800x480 // 480
+    return width * target_height // height, target_height
+
+
+def build_image(task):
+    """
+    Builds all screen size variants of one image. Runs in a worker process.
+    Returns the manifest entries for the variants that were built.
+    """
+    source_path, name, rule, screen_sizes, output_dir = task
+
+    image = pygame.image.load(source_path)
+    has_alpha = image.get_flags() & pygame.SRCALPHA or image.get_colorkey() is not None
+    # smoothscale needs a 24 or 32 bit image
+    if image.get_bitsize() not in (24, 32):
+        converted = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+        converted.blit(image, (0, 0))
+        image = converted
+
+    extension = ".png" if has_alpha else ".jpg"
+    source_mtime = os.stat(source_path).st_mtime_ns
+
+    entries = []
+    for resolution, screen_size in screen_sizes:
+        target_size = get_target_size(image.get_size(), rule, screen_size)
+        # never scale up, the game does that at runtime if it has to
+        if target_size[0] >= image.get_width() or target_size[1] >= image.get_height():
+            continue
+
+        file_name = os.path.splitext(name)[0] + extension
+        built_file = "built/" + resolution + "/" + file_name
+        built_path = os.path.join(output_dir, resolution, *file_name.split("/"))
+        os.makedirs(os.path.dirname(built_path), exist_ok=True)
+
+        # skip images that are already built from the same source
+        if not os.path.exists(built_path) or os.stat(built_path).st_mtime_ns < source_mtime:
+            pygame.image.save(pygame.transform.smoothscale(image, target_size), built_path)
+
+        entries.append((resolution, name, {"file": built_file,
+                                           "size": list(target_size),
+                                           "source_mtime_ns": source_mtime}))
+    return entries
+
+
+def get_tasks(image_dir, output_dir, screen_sizes):
+    tasks = []
+    for folder, rule in folders.items():
+        folder_path = os.path.join(image_dir, *folder.split("/"))
+        for file_name in sorted(os.listdir(folder_path)):
+            name = folder + "/" + file_name
+            if not file_name.lower().endswith(image_extensions) or name in skipped_images:
+                continue
+            tasks.append((os.path.join(folder_path, file_name), name,
+                          images.get(name, rule), screen_sizes, output_dir))
+    return tasks
+
+
+def build(resolution_list, workers=None):
+    settings = Settings()
+    output_dir = settings.built_image_dir
+    screen_sizes = [(resolution, tuple(int(value) for value in resolution.lower().split("x")))
+                    for resolution in resolution_list]
+
+    start = time.perf_counter()
+    tasks = get_tasks(settings.image_dir, output_dir, screen_sizes)
+
+    manifest = {"version": 1, "variants": {resolution: {} for resolution, _ in screen_sizes}}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for entries in executor.map(build_image, tasks):
+            for resolution, name, entry in entries:
+                manifest["variants"][resolution][name] = entry
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "manifest.json"), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+
+    count = sum(len(variants) for variants in manifest["variants"].values())
+    print(f"built {count} images from {len(tasks)} sources in {time.perf_counter() - start:.1f} s")
+    for resolution, variants in manifest["variants"].items():
+        print(f"  {resolution:<10} {len(variants)} images")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build optimized images for each screen size")
+    parser.add_argument("--resolutions", nargs="+", default=resolutions, help="list of WIDTHxHEIGHT")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, default is all cores")
+    args = parser.parse_args()
+
+    build(args.resolutions, args.workers)
+    sys.exit(0)
@@ -15,19 +15,24 @@ flashing effect.
 """
 
 import math
+import time
 import pygame
-from pygame_lib import Utils, Fader, Zoomer
+from pygame_lib import Utils, Fader, Zoomer, DirtyTracker, RenderQueue, Allocations, SoundBank, AVSyncMonitor
 
 from tile_light import TileLight
 
 
 class GameBoard:
+    # smallest board kept in the zoom pyramid, and the rows scaled at a time when building it
+    min_zoom_level_height = 64
+    zoom_level_rows = 32
 
     def __init__(self, settings):
         self.settings = settings
         self.screen = pygame.display.get_surface()
         self.fader = Fader(self.settings.fps)
         self.zoomer = Zoomer(self.settings.fps)
+        self.dirty = DirtyTracker()
 
         # load sounds
         self.last_pulse_sound = 0
@@ -37,15 +42,21 @@ class GameBoard:
 
         # setup game board
         board_height = self.screen.get_height() * 440 // 480
-        if board_height <= 480:     board_file_name = self.settings.patternboards[0]
-        elif board_height <= 1200:  board_file_name = self.settings.patternboards[1]
-        else:                       board_file_name = self.settings.patternboards[2]
+        board_file_name = self.settings.get_patternboard(board_height)
 
         self.board_image_path = self.settings.get_imagePath("gameplay/" + board_file_name)
         self.game_board_full = Utils.load_image_to_fixed_height(self.board_image_path, board_height, True)
         self.tiles = []
         self.setup_game_board()
 
+        # the win animation scales the board from a pyramid of smaller boards,
+        # each half the size of the one before, so every zoom frame scales a board
+        # not much bigger than the frame. The pyramid is built while the player
+        # takes their turn
+        self.zoom_levels = [self.game_board_full]
+        self.next_zoom_level = None
+        self.next_zoom_row = 0
+
 
         # calculate tile size
         self.num_tiles = self.settings.num_tiles_x * self.settings.num_tiles_y
@@ -68,12 +79,23 @@ class GameBoard:
 
     def setup_game_board(self, zoom_level=100):
 
-        self.game_board = self.game_board_full.copy()
-
         if zoom_level != 100:
-            scale_x = self.game_board.get_width() * zoom_level // 100
-            scale_y = self.game_board.get_height() * zoom_level // 100
-            self.game_board = pygame.transform.scale(self.game_board, (scale_x, scale_y))
+            self.set_board_surface(self.scale_game_board(zoom_level))
+        else:
+            # copy, the loaded board is shared and set_alpha changes it
+            # the zoom frames are scaled into this copy too, reset makes a new one
+            self.set_board_surface(self.game_board_full.copy())
+            self.zoom_buffer = self.game_board
+            Allocations.add("GameBoard")
+
+    def scale_game_board(self, zoom_level):
+        scale_x = self.game_board_full.get_width() * zoom_level // 100
+        scale_y = self.game_board_full.get_height() * zoom_level // 100
+        Allocations.add("GameBoard")
+        return pygame.transform.scale(self.game_board_full, (scale_x, scale_y))
+
+    def set_board_surface(self, game_board):
+        self.game_board = game_board
 
         self.board_width = self.game_board.get_width()
         self.board_height = self.game_board.get_height()
@@ -87,6 +109,12 @@ class GameBoard:
 
     def setup_tiles(self):
 
+        # tiles are created once and reset for every round
+        if len(self.tiles) == self.num_tiles:
+            for tile in self.tiles:
+                tile.reset()
+            return
+
         # setup tile collection
         self.tiles = []
 
@@ -110,6 +138,7 @@ class GameBoard:
 
     def turn_on_tile(self, tile_number):
         self.tiles[tile_number-1].turn_on()
+        AVSyncMonitor.visual_started("pulse")
         self.pulse_play_sound()
 
     def turn_on_selector(self, tile_number):
@@ -130,18 +159,27 @@ class GameBoard:
 
     def pulse_play_sound(self):
         if not self.settings.sound_fx_on:
+            # no sound to measure the pulse against
+            AVSyncMonitor.discard("pulse")
             return
         # alternate between multiple pulse sounds
         self.last_pulse_sound += 1
         if self.last_pulse_sound >= len(self.pulse_sounds):
             self.last_pulse_sound = 0
 
-        self.settings.play_sound(self.pulse_sounds[self.last_pulse_sound])
+        # tile pulses are part of the code to remember, they always play
+        channel = self.settings.play_sound(self.pulse_sounds[self.last_pulse_sound], SoundBank.PRIORITY_HIGH)
+        if channel is not None:
+            AVSyncMonitor.sound_started("pulse")
+        else:
+            AVSyncMonitor.discard("pulse")
 
-    def pulse_tile(self, tile_number):
+    # start_time is the GameClock time the pulse was scheduled for, now if it is None
+    def pulse_tile(self, tile_number, start_time=None):
         if not self.is_pulsing(tile_number):
             self.tile_number = tile_number
-            self.tiles[tile_number-1].pulse(self.settings.tile_pulse_duration_per_level[self.settings.difficulty])
+            self.tiles[tile_number-1].pulse(self.settings.tile_pulse_duration_per_level[self.settings.difficulty], start_time)
+            AVSyncMonitor.visual_started("pulse")
             self.pulse_play_sound()
 
 
@@ -169,6 +207,49 @@ class GameBoard:
         return tile_y * self.settings.num_tiles_x + tile_x + 1
 
 
+    # builds the zoom pyramid for at most max_ms, a few rows at a time
+    def prepare_zoom_levels(self, max_ms=2):
+        start = time.perf_counter()
+        while (time.perf_counter() - start) * 1000 < max_ms:
+            source = self.zoom_levels[-1]
+            if self.next_zoom_level is None:
+                width, height = source.get_width() // 2, source.get_height() // 2
+                if height < GameBoard.min_zoom_level_height:
+                    # smaller boards are cheap to scale from the last level
+                    return
+                # same pixel format as the board, transform.scale into a surface needs it
+                self.next_zoom_level = pygame.Surface((width, height), source.get_flags(), source)
+                Allocations.add("GameBoard")
+                self.next_zoom_row = 0
+
+            # scale the next rows from the rows of the bigger level
+            level = self.next_zoom_level
+            y = self.next_zoom_row
+            rows = min(GameBoard.zoom_level_rows, level.get_height() - y)
+            pygame.transform.scale(source.subsurface((0, y * 2, source.get_width(), rows * 2)),
+                                   (level.get_width(), rows),
+                                   level.subsurface((0, y, level.get_width(), rows)))
+            self.next_zoom_row += rows
+            if self.next_zoom_row == level.get_height():
+                self.zoom_levels.append(level)
+                self.next_zoom_level = None
+
+    # scales the board for the exact zoom value from the smallest finished level
+    # that is still big enough. Without prepared levels (the player was very
+    # fast) it scales from the full board, like it always did
+    def set_zoom_frame(self, zoom):
+        width = int(self.game_board_full.get_width() * zoom // 100)
+        height = int(self.game_board_full.get_height() * zoom // 100)
+        source = self.game_board_full
+        for level in self.zoom_levels:
+            if level.get_width() >= width and level.get_height() >= height:
+                source = level
+
+        # no new surface per frame, the frame is a part of the full size board copy
+        frame = self.zoom_buffer.subsurface((0, 0, width, height))
+        pygame.transform.scale(source, (width, height), frame)
+        self.set_board_surface(frame)
+
     def zoom_reset(self):
         self.zoomer.reset()
 
@@ -195,12 +276,13 @@ class GameBoard:
     def draw(self):
         zoom = self.zoomer.get_next_zoom()
         if zoom < 100:
-            self.setup_game_board(zoom)
+            self.set_zoom_frame(zoom)
 
         alpha = self.fader.get_next_alpha()
         self.game_board.set_alpha(alpha)
 
-        self.screen.blit(self.game_board, (self.board_x, self.board_y))
+        rect = RenderQueue.submit(self.screen, self.game_board, (self.board_x, self.board_y), RenderQueue.LAYER_SCENE)
+        self.dirty.update(rect, alpha)
 
         for tile in self.tiles:
             tile.draw()
@@ -1,7 +1,7 @@
 """
 Game Loop
 ---------
-This is the main game loop.  It creates the game screens and links them
+This is the main game loop.  It registers the game screens and links them
 together.  The screens are:
 
 - splash screen
@@ -13,12 +13,17 @@ Each one is a separate class with its own update and draw method.
 The update method returns the next screen to display which can be the existing
 screen or another one. The game loop then switches to the new screen.
 
+Screens are registered as factories (see LazyScreen) and only built when they
+are first needed, so the splash screen shows up quickly and the other screens
+are built while it is on screen.
+
 This process continues until the game is done. The game is done when the user
 quits the game or the game is over.
 
 """
 # system libraries
 import os
+import time
 import pygame
 
 # game screens
@@ -30,34 +35,74 @@ from secret_chamber import SecretChamber
 # settings shared by all game screens
 from settings import Settings
 
+from pygame_lib import DirtyRects, GameClock, LazyScreen, StartupReport, AssetPreloader, InputFilter, SurfaceCache, AssetRegistry, FontCache, RenderQueue, Allocations, SoundBank, SoundCache, AVSyncMonitor
+
 
 class GameLoop:
 
-    def __init__(self):
+    # event types used by the game screens, all other events are blocked
+    # expose events are kept so the whole screen can be redrawn in dirty rect mode
+    allowed_events = [pygame.QUIT,
+                      pygame.KEYDOWN,
+                      pygame.MOUSEBUTTONDOWN,
+                      pygame.MOUSEMOTION,
+                      pygame.VIDEOEXPOSE,
+                      pygame.WINDOWEXPOSED]
+
+    def __init__(self, start_time=None):
         """
         Initializes a new instance of the Game class.
+        start_time is the time.perf_counter() value when the process started,
+        it is used to report the startup time.
         """
+        StartupReport.begin(start_time, Settings.startup_budget_ms)
+        StartupReport.add("imports", StartupReport.elapsed())
+
+        # the mixer is started by pygame.init, so its setup has to come first
+        pygame.mixer.pre_init(Settings.mixer_frequency, Settings.mixer_size,
+                              Settings.mixer_channels, Settings.mixer_buffer)
+
         # initialize pygame
-        pygame.init()
+        with StartupReport.measure("pygame.init"):
+            pygame.init()
 
 
         # load settings
         self.settings = Settings()
 
+        # all timers and animations follow the game clock
+        GameClock.configure(self.settings.time_scale)
+
+        # decode assets on background threads while the splash screen is showing
+        if self.settings.progressive_startup:
+            AssetPreloader.start(self.settings.preload_workers)
+
         # initialize sound mixer and load background music
-        pygame.mixer.init()
-        self.load_background_music()
+        with StartupReport.measure("mixer.init"):
+            pygame.mixer.init()
+            SoundBank.configure(self.settings.sound_channels)
+
+        # measure the lag between tile pulses and their sounds
+        AVSyncMonitor.configure(self.settings.av_sync_log, self.settings.mixer_buffer, self.settings.mixer_frequency)
+
+        # keep decoded sounds on disk for the next start
+        if self.settings.sound_cache_on:
+            SoundCache.configure(os.path.join(self.settings.cache_dir, "sounds"),
+                                 self.settings.sound_cache_max_mb * 1024 * 1024)
+        with StartupReport.measure("music load"):
+            self.load_background_music()
 
         # set screen size and mode
-        if self.settings.screen_mode == "fullscreen":
-            # get screen size
-            info_object = pygame.display.Info()
-            self.settings.screen_size = (info_object.current_w,info_object.current_h)
-            #
-            self.screen = pygame.display.set_mode(self.settings.screen_size, pygame.FULLSCREEN)
-        else:
-            # use size defined in settings
-            self.screen = pygame.display.set_mode(self.settings.screen_size, 0, 32)
+        with StartupReport.measure("display.set_mode"):
+            if self.settings.screen_mode == "fullscreen":
+                # get screen size
+                info_object = pygame.display.Info()
+                self.settings.screen_size = (info_object.current_w,info_object.current_h)
+                #
+                self.screen = pygame.display.set_mode(self.settings.screen_size, pygame.FULLSCREEN)
+            else:
+                # use size defined in settings
+                self.screen = pygame.display.set_mode(self.settings.screen_size, 0, 32)
 
         # graphics are sized for 800x480 screen
         # set scale for icons, torches, fonts, etc
@@ -67,30 +112,123 @@ class GameLoop:
         # set window title
         pygame.display.set_caption(self.settings.game_title)
 
-        # create game screens and pass settings into each screen
-        # any updates to settings (like score) will be available to all screens
-        self.splash_screen = SplashPage(self.settings)
-        self.main_menu = MainMenu(self.settings)
-        self.game_play = GamePlay(self.settings)
-        self.secret_chamber = SecretChamber(self.settings)
-
-        # link game screens to each other
-        # each game screen needs to know about the other game screens
-        # splash_screen -> main_menu -> game_play -> secret_chamber -> main_menu
-        self.splash_screen.main_menu = self.main_menu
-        self.main_menu.game_play = self.game_play
-        self.game_play.main_menu = self.main_menu
-        self.game_play.secret_chamber = self.secret_chamber
-        self.secret_chamber.main_menu = self.main_menu
+        # widgets report the areas they changed if dirty rect mode is on
+        DirtyRects.enable(self.settings.dirty_rect_mode)
+
+        # drop unused event types and merge mouse motion events
+        self.input_filter = InputFilter(self.allowed_events)
+
+        # keep scaled images on disk for the next start
+        if self.settings.surface_cache_on:
+            SurfaceCache.configure(os.path.join(self.settings.cache_dir, "surfaces"),
+                                   self.settings.surface_cache_max_mb * 1024 * 1024)
+
+        # share loaded images between screens and widgets
+        AssetRegistry.configure(self.settings.asset_registry_max_mb * 1024 * 1024)
+
+        # register game screens, each one is built the first time it is needed
+        self.screens = {"splash":         LazyScreen("splash", self.create_splash_screen),
+                        "main_menu":      LazyScreen("main_menu", self.create_main_menu),
+                        "game_play":      LazyScreen("game_play", self.create_game_play),
+                        "secret_chamber": LazyScreen("secret_chamber", self.create_secret_chamber)}
 
         # set the first screen to splash screen,
         # can also set the first screen to any other screen
         # which can save time when testing
 
-        self.current_screen = self.splash_screen
-        # self.current_screen = self.main_menu
-        # self.current_screen = self.game_play
-        #self.current_screen = self.secret_chamber
+        self.current_screen = self.get_screen("splash")
+        # self.current_screen = self.get_screen("main_menu")
+        # self.current_screen = self.get_screen("game_play")
+        # self.current_screen = self.get_screen("secret_chamber")
+
+        # the splash screen requested its image first, queue everything else after it
+        if self.settings.progressive_startup:
+            self.preload_assets()
+        else:
+            with StartupReport.measure("sounds"):
+                SoundBank.preload(self.settings.get_sound_paths())
+
+
+    def preload_assets(self):
+        """
+        Queues the game play images, fonts and sounds for decoding on the
+        background threads, in the order the screens need them. Wallpapers and
+        chamber images are picked at random when they are shown and are not
+        preloaded here.
+        """
+        board_height = self.screen.get_height() * 440 // 480
+        for image_file in ["pharao1.png", "torch_sprite.png", self.settings.get_patternboard(board_height)]:
+            AssetPreloader.request_image(self.settings.get_imagePath("gameplay/" + image_file))
+
+        for font_file in sorted(os.listdir(self.settings.font_dir)):
+            if font_file.endswith(".ttf"):
+                AssetPreloader.request_font(os.path.join(self.settings.font_dir, font_file))
+
+        SoundBank.preload(self.settings.get_sound_paths())
+
+
+    # create game screens and pass settings into each screen
+    # any updates to settings (like score) will be available to all screens
+    # link game screens to each other, links point to the lazy screens
+    # splash_screen -> main_menu -> game_play -> secret_chamber -> main_menu
+    def create_splash_screen(self):
+        splash_screen = SplashPage(self.settings)
+        splash_screen.main_menu = self.screens["main_menu"]
+        return splash_screen
+
+    def create_main_menu(self):
+        main_menu = MainMenu(self.settings)
+        main_menu.game_play = self.screens["game_play"]
+        return main_menu
+
+    def create_game_play(self):
+        game_play = GamePlay(self.settings)
+        game_play.main_menu = self.screens["main_menu"]
+        game_play.secret_chamber = self.screens["secret_chamber"]
+        return game_play
+
+    def create_secret_chamber(self):
+        secret_chamber = SecretChamber(self.settings)
+        secret_chamber.main_menu = self.screens["main_menu"]
+        return secret_chamber
+
+
+    def draw_frame(self):
+        # the screen queues its blits, they are drawn in layer order in one go
+        RenderQueue.begin(self.screen)
+        self.current_screen.draw()
+
+        # clear to black, unless a full screen image covers everything anyway
+        if not RenderQueue.covers_screen():
+            self.screen.fill((0, 0, 0))
+        RenderQueue.flush()
+        self.update_display()
+        AVSyncMonitor.frame_presented()
+        Allocations.end_frame()
+
+
+    def get_screen(self, name):
+        lazy_screen = self.screens[name]
+        was_built = lazy_screen.is_built
+        screen = lazy_screen.screen
+        if not was_built:
+            StartupReport.add("screen " + name, lazy_screen.build_time)
+            if self.settings.show_load_times:
+                print(f"screen {name} built in {lazy_screen.build_time:.1f} ms")
+                print(AssetRegistry.get_report())
+                print(FontCache.get_report())
+        return screen
+
+
+    def preload_next_screen(self):
+        # build at most one screen per frame so frames keep coming
+        for name, lazy_screen in self.screens.items():
+            if not lazy_screen.is_built:
+                self.get_screen(name)
+                return
+
+        # all screens are built, startup is complete
+        StartupReport.finish(self.settings.show_startup_report)
 
 
     def load_background_music(self):
@@ -103,48 +241,136 @@ class GameLoop:
             self.settings.background_music_available = False
 
 
-    def run(self):
+    def update_display(self):
+        if not self.settings.dirty_rect_mode:
+            pygame.display.update()
+            return
+
+        # only update the areas widgets reported as changed
+        # None means the whole screen has to be updated (fades, screen changes)
+        rects = DirtyRects.flush()
+        if rects is None:
+            pygame.display.update()
+        elif rects:
+            pygame.display.update(rects)
+
+
+    def is_idle(self):
+        # idle when there was no input and no animation for a while
+        if self.settings.idle_fps <= 0:
+            return False
+        return GameClock.now() - self.last_activity > self.settings.idle_delay * 1000
+
+
+    def get_frame_rate(self):
+        # each screen can have its own frame rate, default is the full rate
+        fps = getattr(self.current_screen, "target_fps", self.settings.fps)
+        if self.is_idle():
+            fps = min(fps, self.settings.idle_fps)
+        return fps
+
+
+    def wait_for_next_frame(self, clock):
         """
-        Runs the game loop, handling events and updating the screen.
+        Waits for the next frame and returns the events for that frame.
+        While idle, input events end the wait at once instead of waiting
+        for the next idle frame.
         """
-        clock = pygame.time.Clock()
+        if not self.is_idle():
+            clock.tick(self.get_frame_rate())
+            return pygame.event.get()
 
-        # start background music - only play it once
-        # use volume defined in settings
-        self.settings.background_music("play", self.settings.initial_music_volume)
-
-        done = False
-        while not done:
-            clock.tick(self.settings.fps)
-            events = pygame.event.get()
+        frame_time = 1000 // self.get_frame_rate()
+        wait_time = frame_time - (pygame.time.get_ticks() - GameClock.frame_ticks)
+        event = pygame.event.wait(max(1, wait_time))
+        clock.tick()
 
-            # check for quit events
-            for event in events:
-                if event.type == pygame.QUIT:
-                    done = True
-                    break
+        if event.type == pygame.NOEVENT:
+            return pygame.event.get()
+        return [event] + pygame.event.get()
 
-            #if done: continue
 
-            # call update on current screen (any of splash, main menu, game play, secret chamber)
-            # update returns next screen, which can be the same or new screen
-            next_screen = self.current_screen.update(events)
+    def run_frame(self, events, keep_screen=False):
+        """
+        Runs one frame with the given events: updates the current screen,
+        switches to the next screen or draws the frame. Returns False when
+        the game is done. keep_screen stays on the current screen whatever
+        update returns (used by the benchmark).
+        update_ms and draw_ms are set to the time each step took.
+        """
+        done = False
+        # all animations in this frame use the same frame time
+        GameClock.tick()
 
+        # check for quit events
+        for event in events:
+            if event.type == pygame.QUIT:
+                done = True
+                break
+            # window was covered or restored, redraw all of it
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                DirtyRects.add_full()
+
+        # call update on current screen (any of splash, main menu, game play, secret chamber)
+        # update returns next screen, which can be the same or new screen
+        start = time.perf_counter()
+        next_screen = self.current_screen.update(events)
+        update_end = time.perf_counter()
+        self.update_ms = (update_end - start) * 1000
+        self.draw_ms = 0
+
+        if not keep_screen:
             # if next_screen is 'None' it means quit
             if next_screen is None:
-                done = True
-                continue
+                return False
 
             # if new screen, skip updating current screen
+            # linked screens may not be built yet
+            next_screen = LazyScreen.resolve(next_screen)
             if next_screen != self.current_screen:
                 self.current_screen = next_screen
-                continue
+                self.last_activity = GameClock.now()
+                DirtyRects.add_full()
+                return not done
 
-            # redraw screen. Start with fill to black and redraw everything
-            self.screen.fill((0, 0, 0))
-            self.current_screen.draw()
-            pygame.display.update()
+        self.draw_frame()
+        self.draw_ms = (time.perf_counter() - update_end) * 1000
+
+        # the first frame counts once the screen showed something, not just black
+        if StartupReport.get_mark("first frame") is None and getattr(self.current_screen, "has_content", True):
+            StartupReport.mark("first frame")
+
+        # build the other screens after the splash screen is showing
+        if self.settings.preload_screens:
+            self.preload_next_screen()
+        else:
+            StartupReport.finish(self.settings.show_startup_report)
+
+        # input or running animations keep the full frame rate
+        if events or GameClock.animating:
+            self.last_activity = GameClock.now()
+
+        return not done
+
+
+    def run(self):
+        """
+        Runs the game loop, handling events and updating the screen.
+        """
+        clock = pygame.time.Clock()
+
+        # start background music - only play it once
+        # use volume defined in settings
+        self.settings.background_music("play", self.settings.initial_music_volume)
+
+        self.last_activity = GameClock.tick()
+
+        while self.run_frame(self.input_filter.filter(self.wait_for_next_frame(clock))):
+            pass
 
         # stop and fade background music
         self.settings.background_music(False)
+        AssetPreloader.stop()
+        if self.settings.av_sync_log:
+            print(AVSyncMonitor.get_report())
         pygame.quit()
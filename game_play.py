@@ -16,7 +16,7 @@ import pygame, random
 from enum import Enum
 
 # game libraries
-from pygame_lib import Utils, ScreenFader, TextLine, Timer, Color
+from pygame_lib import Utils, ScreenFader, TextLine, Timer, Color, DirtyTracker, WidgetManager, Timeline
 from background import Background
 from game_board import GameBoard
 
@@ -42,8 +42,12 @@ class GamePlay:
     def __init__(self, settings):
         self.settings = settings
         self.screen = pygame.display.get_surface()
+        self.target_fps = settings.game_play_fps
         self.game_board = GameBoard(settings)
         self.background = Background(settings)
+        self.widgets = WidgetManager()
+        self.widgets.add(self.background.exit_button, self.background.exit_button.button_area,
+                         lambda: self.set_game_state(GameState.GAME_EXIT))
         self.screen_fader = ScreenFader(settings.fps)
         self.game_state_timer = Timer()
         self.delay_timer = Timer()
@@ -51,6 +55,16 @@ class GamePlay:
         self.score_show = False
         self.board_size = self.screen.get_height() * 440 // 480
 
+        # status and score lines only render again when their text changes
+        self.status_text_size = 25 * self.settings.screen_scale_x
+        status_font_path = self.settings.get_fontPath(self.settings.instructions_font)
+        self.status_text = TextLine(self.screen, "", Color.WHITE, status_font_path, self.status_text_size, self.settings.fps, 2)
+        self.score_text = TextLine(self.screen, "", Color.WHITE, status_font_path, self.status_text_size, self.settings.fps, 2)
+
+        # the status line moves when the score is shown, so the area
+        # below the game board is tracked as a whole for dirty rect updates
+        self.status_dirty = DirtyTracker()
+
         # links to other game screens
         # these will be assigned in game_loop.py
         self.main_menu = None
@@ -61,8 +75,10 @@ class GamePlay:
 
     def update(self, events):
 
-        if self.background.update(events):
-            self.set_game_state(GameState.GAME_EXIT)
+        self.background.update(events)
+
+        # hover and button clicks
+        self.widgets.update(events)
 
         # check for keyboard and mouse events
         # and store them in a list
@@ -74,11 +90,7 @@ class GamePlay:
                     case pygame.K_ESCAPE: self.set_game_state(GameState.RETURN_TO_MENU)
                     case pygame.K_q:      self.set_game_state(GameState.GAME_EXIT)
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if self.background.exit_button.is_clicked(event.pos):
-                    self.set_game_state(GameState.RETURN_TO_MENU)
-
-            if GameState.PLAYER_TURN:
+            if self.game_state == GameState.PLAYER_TURN:
                 # if arrow key is pressed
                 if event.type == pygame.KEYDOWN and \
                     event.key in [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE]:
@@ -155,6 +167,7 @@ class GamePlay:
             self.computer_sequence_index = 0
             self.computer_sequence_started = False
             self.computer_sequence_ended = False
+            self.computer_timeline = None
             self.game_board.reset()
 
         if state == GameState.PLAYER_TURN:
@@ -194,6 +207,9 @@ class GamePlay:
         # that the computer pulsed
         # if player_sequence is empty, wait for player to click on a tile
 
+        # get the win animation ready while waiting for the player
+        self.game_board.prepare_zoom_levels()
+
         if not self.player_sequence_started:
             self.show_status("Your Turn")
             self.game_board.turn_on_selector (self.selector_tileNumber)
@@ -217,7 +233,7 @@ class GamePlay:
             for events in player_events:
 
                 if events.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_coords = pygame.mouse.get_pos()
+                    mouse_coords = events.pos
                     if self.game_board.coords_inside_board(mouse_coords[0], mouse_coords[1]):
                         tileNumber = self.game_board.get_tile_number_from_coords(mouse_coords[0], mouse_coords[1])
                         tile_selected = True
@@ -236,7 +252,7 @@ class GamePlay:
                         tile_selected = True
 
                 elif events.type == pygame.MOUSEMOTION:
-                    mouse_coords = pygame.mouse.get_pos()
+                    mouse_coords = events.pos
                     tileNumber = self.game_board.get_tile_number_from_coords(mouse_coords[0], mouse_coords[1])
 
         if tile_selected:
@@ -278,6 +294,15 @@ class GamePlay:
                 self.show_status("Incorrect!")
 
 
+    # the tiles pulse one after the other, 1.5 seconds after the computer's turn starts
+    # a pulse fades in and out, each for the pulse duration of the difficulty level
+    def create_computer_timeline(self, sequence):
+        pulse_ms = self.settings.tile_pulse_duration_per_level[self.settings.difficulty] * 2000
+        timeline = Timeline()
+        for i, tileNumber in enumerate(sequence):
+            timeline.add(tileNumber, 1500 + i * pulse_ms, pulse_ms)
+        return timeline
+
     def computer_turn(self):
         # generate a random sequence of numbers to pulse
         # for the player to repeat
@@ -289,25 +314,24 @@ class GamePlay:
             self.computer_sequence_index = 1
             self.computer_sequence_started = True
 
+            # the whole sequence is planned now and played by the clock,
+            # so a slow frame doesn't throw off the rhythm
+            self.computer_timeline = self.create_computer_timeline(self.computer_sequence)
+            self.computer_timeline.start()
+
         self.show_status("Computer's Turn")
         self.show_score()
 
-        tileNumber = self.computer_sequence[self.computer_sequence_index-1]
+        # pulse the tiles that are due, with the time they were planned for
+        for tileNumber, start_time, _ in self.computer_timeline.get_due():
+            self.game_board.pulse_tile(tileNumber, start_time)
+            self.computer_sequence_index += 1
 
-        # pulse the tiles in the sequence, wait 1.5 seconds before generating a new sequence
-        if self.game_state_timer.get_elapsed_time() > 1500:
-
-            if not self.game_board.pulse_started(tileNumber):
-                self.game_board.pulse_tile(tileNumber)
-
-            if self.game_board.pulse_ended(tileNumber):
-                self.computer_sequence_index += 1
-
-            if self.computer_sequence_index > len(self.computer_sequence):
-                self.computer_sequence_ended = True
-                self.hide_status()
-                self.set_game_state(GameState.PLAYER_TURN)
-                return
+        if self.computer_timeline.is_finished():
+            self.computer_sequence_ended = True
+            self.hide_status()
+            self.set_game_state(GameState.PLAYER_TURN)
+            return
 
     def show_score(self):
         self.score_show = True
@@ -329,20 +353,25 @@ class GamePlay:
         self.background.draw()
         self.game_board.draw()
 
-        statusTextSize = 25 * self.settings.screen_scale_x
+        statusTextSize = self.status_text_size
+
+        status_area = pygame.Rect(0, self.screen.get_height() - statusTextSize,
+                                  self.screen.get_width(), statusTextSize)
+        self.status_dirty.update(status_area, (self.status_show, self.status_message,
+                                               self.score_show, self.score))
 
         if self.status_show:
-            statusText = TextLine(self.screen,self.status_message, Color.WHITE, self.settings.get_fontPath(self.settings.instructions_font), statusTextSize , self.settings.fps, 2)
+            self.status_text.set_text(self.status_message)
             if not self.score_show:
-                statusText.draw(-1, self.screen.get_height() - statusTextSize)
+                self.status_text.draw(-1, self.screen.get_height() - statusTextSize)
             else:
-                statusText.draw(self.screen.get_width() // 2 - self.board_size // 2,
+                self.status_text.draw(self.screen.get_width() // 2 - self.board_size // 2,
                                 self.screen.get_height() - statusTextSize)
 
         if self.score_show:
             # show score to the right of the game board
-            scoreText = TextLine(self.screen,"Score: " + str(self.score) + "/" + str(self.settings.wins_to_open_chamber), Color.WHITE, self.settings.get_fontPath(self.settings.instructions_font), statusTextSize, self.settings.fps, 2)
-            scoreText.draw(self.screen.get_width() // 2 + self.board_size // 2 - (100 * self.settings.screen_scale_x),
+            self.score_text.set_text("Score: " + str(self.score) + "/" + str(self.settings.wins_to_open_chamber))
+            self.score_text.draw(self.screen.get_width() // 2 + self.board_size // 2 - (100 * self.settings.screen_scale_x),
                         self.screen.get_height() - statusTextSize)
 
         self.screen_fader.draw()
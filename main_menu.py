@@ -11,7 +11,7 @@ from the main menu screen.
 import pygame
 
 # game libraries
-from pygame_lib import Button, Utils, ScreenFader, TextLine, Color, RoundedRect
+from pygame_lib import Button, Utils, ScreenFader, TextLine, Color, RoundedRect, StaticLayer, WidgetManager
 from background import Background
 
 class MainMenu:
@@ -19,6 +19,7 @@ class MainMenu:
 
         self.settings = settings
         self.window = pygame.display.get_surface()
+        self.target_fps = settings.main_menu_fps
         self.menu_exit = False
 
         # load fonts
@@ -53,6 +54,14 @@ class MainMenu:
                                                self.settings.fps,
                                                100)
 
+        # headings and instructions don't change until they fade out, so they
+        # are drawn once into a static layer. The layer goes above the
+        # pharaohs and torches, so they still walk behind the instructions box
+        self.static_layer = StaticLayer(self.window)
+
+        # the buttons are hit tested and clicked through the widget manager
+        self.widgets = WidgetManager()
+
 
         # setup the difficulty buttons: easy, medium, hard
         button_y = Utils.y_percent(self.window,85)
@@ -69,8 +78,13 @@ class MainMenu:
                                                    self.window.get_width() * 2 // 3 + (20 * self.settings.screen_scale_x),
                                                    button_y,
                                                    width)
+        self.widgets.add(self.easy_button, self.easy_button.button_area, lambda: self.select_difficulty(0))
+        self.widgets.add(self.medium_button, self.medium_button.button_area, lambda: self.select_difficulty(1))
+        self.widgets.add(self.hard_button, self.hard_button.button_area, lambda: self.select_difficulty(2))
 
         # setup the sound buttons: music, sound
+        self.music_button = None
+        self.sound_button = None
         self.create_sound_buttons()
 
         # link to the game_play screen
@@ -80,11 +94,19 @@ class MainMenu:
 
         # setup the background
         self.background = Background(settings)
+        self.widgets.add(self.background.exit_button, self.background.exit_button.button_area, self.exit_menu)
 
         # setup a fader so screen can be faded in and out
         self.screen_fader = ScreenFader(settings.fps)
 
     def create_sound_buttons(self):
+        # the music and sound labels are next to the check boxes
+        self.static_layer.invalidate()
+
+        # the old check boxes are replaced
+        self.widgets.remove(self.music_button)
+        self.widgets.remove(self.sound_button)
+
         button_y = self.window.get_height() - (18 * self.settings.screen_scale_y)
         self.music_button = self.create_check_box(self.window.get_width() // 2 - (120 * self.settings.screen_scale_x),
                                                   button_y,
@@ -92,6 +114,8 @@ class MainMenu:
         self.sound_button = self.create_check_box(self.window.get_width() // 2 + (30 * self.settings.screen_scale_x),
                                                   button_y,
                                                   self.settings.sound_fx_on)
+        self.widgets.add(self.music_button, self.music_button.button_area, self.toggle_music)
+        self.widgets.add(self.sound_button, self.sound_button.button_area, self.toggle_sound)
 
     def reset(self):
         self.menu_exit = False
@@ -130,6 +154,7 @@ class MainMenu:
 
     def fade_out_center(self):
         # self.score.fade_out()
+        self.static_layer.invalidate()
         self.heading1.fade_out()
         self.heading2.fade_out()
         self.heading3.fade_out()
@@ -166,10 +191,41 @@ class MainMenu:
         self.screen_fader.reset()
 
 
+    def select_difficulty(self, difficulty):
+        self.settings.difficulty = difficulty
+        self.fade_out_center()
+
+    def exit_menu(self):
+        self.menu_exit = True
+        self.screen_fader.fade_out()
+
+    def toggle_music(self):
+        if self.settings.background_music_on:
+            self.settings.background_music("pause")
+            self.settings.background_music_on = False
+            self.create_sound_buttons()
+        else:
+            self.settings.background_music_on = True
+            self.settings.background_music("unpause")
+            self.create_sound_buttons()
+
+    def toggle_sound(self):
+        self.settings.sound_fx_on = not self.settings.sound_fx_on
+        self.easy_button.play_sound = not self.easy_button.play_sound
+        self.medium_button.play_sound = not self.medium_button.play_sound
+        self.hard_button.play_sound = not self.hard_button.play_sound
+        self.music_button.play_sound = not self.music_button.play_sound
+        self.sound_button.play_sound = not self.sound_button.play_sound
+        self.create_sound_buttons()
+
+
     def update(self, events):
 
         self.background.update(events)
 
+        # hover and button clicks
+        self.widgets.update(events)
+
         for event in events:
 
             if event.type == pygame.KEYDOWN:
@@ -179,44 +235,6 @@ class MainMenu:
                     self.screen_fader.fade_out()
                     break
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # check if the buttons are clicked
-                if self.easy_button.is_clicked(event.pos):
-                    self.settings.difficulty = 0
-                    self.fade_out_center()
-
-
-                if self.medium_button.is_clicked(event.pos):
-                    self.settings.difficulty = 1
-                    self.fade_out_center()
-
-                if self.hard_button.is_clicked(event.pos):
-                    self.settings.difficulty = 2
-                    self.fade_out_center()
-
-                if self.background.exit_button.is_clicked(event.pos):
-                    self.menu_exit = True
-                    self.screen_fader.fade_out()
-
-                if self.music_button.is_clicked(event.pos):
-                    if self.settings.background_music_on:
-                        self.settings.background_music("pause")
-                        self.settings.background_music_on = False
-                        self.create_sound_buttons()
-                    else:
-                        self.settings.background_music_on = True
-                        self.settings.background_music("unpause")
-                        self.create_sound_buttons()
-
-                if self.sound_button.is_clicked(event.pos):
-                    self.settings.sound_fx_on = not self.settings.sound_fx_on
-                    self.easy_button.play_sound = not self.easy_button.play_sound
-                    self.medium_button.play_sound = not self.medium_button.play_sound
-                    self.hard_button.play_sound = not self.hard_button.play_sound
-                    self.music_button.play_sound = not self.music_button.play_sound
-                    self.sound_button.play_sound = not self.sound_button.play_sound
-                    self.create_sound_buttons()
-
         # fade-in first thing
         if not self.screen_fader.fade_in_started:
             self.background.change_wallpaper()
@@ -241,6 +259,30 @@ class MainMenu:
 
         self.background.draw()
 
+        # static widgets are drawn each frame while they fade
+        if self.heading1.fade_out_started:
+            self.static_layer.dirty.clear()
+            self.draw_static()
+        else:
+            if not self.static_layer.is_valid:
+                with self.static_layer.capture():
+                    self.draw_static()
+            if self.static_layer.is_valid:
+                self.static_layer.draw()
+            else:
+                # the capture came out empty, draw the widgets directly
+                self.draw_static()
+
+        self.easy_button.draw()
+        self.medium_button.draw()
+        self.hard_button.draw()
+
+        self.sound_button.draw()
+        self.music_button.draw()
+
+        self.screen_fader.draw()
+
+    def draw_static(self):
         # draw the text lines on the screen
         # and increment the y with each line by the height of the text line
         y = Utils.y_percent(self.window, 5)
@@ -267,15 +309,3 @@ class MainMenu:
         for text_line in self.instructions:
             text_line.draw(Utils.x_percent(self.window,50)-(250*self.settings.screen_scale_x), y)
             y += text_line.rect.height + (10 * self.settings.screen_scale_y)
-
-        self.easy_button.draw()
-        self.medium_button.draw()
-        self.hard_button.draw()
-
-        self.sound_button.draw()
-        self.music_button.draw()
-
-        screen = pygame.display.get_surface()
-        screen.blit(self.window, (0,0))
-
-        self.screen_fader.draw()
@@ -5,25 +5,31 @@ Loads an image of a pharaoh and moves it back and forth on the screen
 The animation is paused for a random time between 5 and 10 seconds. The pharaoh
 is flipped when it reaches the edge of its movement range. This range deliberately
 goes off the screen so the pharaoh disappears and reappears after a while.
+Both directions are loaded once, flipping just swaps the image. The pharaoh
+walks by the elapsed frame time, so it walks at the same speed at any frame rate.
 """
 # system libraries
 import math
 import random
-import pygame
 
 # game libraries
-from pygame_lib import Utils, Timer
+from pygame_lib import Utils, Timer, DirtyTracker, RenderQueue, GameClock
 
 class Pharaoh:
     def __init__(self, screen, imagePath, x, width, face_left=False, pharao_speed = 0.5):
         self.screen=screen
-        self.pharaoh = Utils.load_image_to_fixed_width(imagePath, width, True)
+        self.pharaoh_right = Utils.load_image_to_fixed_width(imagePath, width, True)
+        self.pharaoh_left = Utils.load_image_to_fixed_width(imagePath, width, True, flip=True)
+        self.pharaoh = self.pharaoh_right
+        self.face_left = False
         self.width = width
         self.x = x
         self.y = self.screen.get_height() - self.pharaoh.get_height() - 1
         self.is_first_delay = True
 
+        # speed is in pixels per frame at 60 fps
         self.x_delta = pharao_speed
+        self.last_frame_time = None
 
         range_of_motion = self.pharaoh.get_width() // 3
 
@@ -38,11 +44,13 @@ class Pharaoh:
 
         self.delay_timer = Timer()
         self.delay_range = (5, 10)
+        self.dirty = DirtyTracker()
 
         self.init_defaults()
 
     def flip(self):
-        self.pharaoh = pygame.transform.flip(self.pharaoh, True, False)
+        self.face_left = not self.face_left
+        self.pharaoh = self.pharaoh_left if self.face_left else self.pharaoh_right
         self.x_delta = -self.x_delta
         if self.x_delta < 0:
             self.x = self.x - (self.pharaoh.get_width() * 60//252 )
@@ -52,13 +60,24 @@ class Pharaoh:
     def init_defaults(self):
         self.delay_in_progress = False
         self.delay_length = 0
+        # walking time left in ms before the next delay
         self.count_down = 0
         self.delay_timer.restart()
 
+    # ms since the last frame, capped so the pharaoh doesn't jump after the screen was hidden
+    def get_frame_step(self):
+        now = GameClock.now()
+        step = 0 if self.last_frame_time is None else min(now - self.last_frame_time, 100 * GameClock.time_scale)
+        self.last_frame_time = now
+        return step
+
 
     def draw (self):
-        self.screen.blit(self.pharaoh, (self.x, self.y))
+        # walks off the screen on purpose, the render queue skips it then
+        rect = RenderQueue.submit(self.screen, self.pharaoh, (self.x, self.y), RenderQueue.LAYER_SCENE)
+        self.dirty.update(rect, self.face_left)
 
+        step = self.get_frame_step()
         if abs(self.x_delta) > 0:
             if not self.delay_in_progress :
                 # On 0 a new delay is initiated
@@ -68,8 +87,8 @@ class Pharaoh:
                     self.delay_length = math.floor(random.randint(self.delay_range[0], self.delay_range[1]) * 1000)
                     self.delay_timer.restart()
                 else:
-                    self.count_down -= 1
-                    self.x = self.x + self.x_delta
+                    self.count_down -= step
+                    self.x = self.x + self.x_delta * step * 60 / 1000
 
                     if  self.x < self.x_range[0] or self.x > self.x_range[1]:
                         self.flip()
@@ -77,7 +96,8 @@ class Pharaoh:
             else:
                 if self.delay_timer.get_elapsed_time() > self.delay_length:
                     self.delay_in_progress = False
-                    self.count_down = random.randint(200, 400)
+                    # 200 to 400 frames at 60 fps
+                    self.count_down = random.randint(200, 400) * 1000 // 60
                     if random.randint(1, 100) <= 10:
                         self.flip()
                         self.count_down = 0
@@ -0,0 +1,79 @@
+"""
+This is a general purpose monitor for the offset between a picture and its
+sound. Game code marks when something starts to show and when its sound is
+played, under the same name. The picture counts as started when the frame
+showing it is on the display (the game loop calls frame_presented() after
+updating the display). The sound counts as started when it was played plus
+the time the mixer buffer needs to reach the speakers.
+
+A positive offset means the sound comes after the picture. Each offset is
+printed, so the mixer buffer can be tuned on each device.
+
+The monitor is off until configure() is called.
+"""
+import time
+
+class AVSyncMonitor:
+    enabled = False
+    output_latency_ms = 0
+    visuals = {}
+    sounds = {}
+    waiting = set()
+    offsets = []
+
+    # buffer and frequency are the mixer settings, they give the output latency
+    @staticmethod
+    def configure(enabled, buffer=0, frequency=44100):
+        AVSyncMonitor.enabled = enabled
+        AVSyncMonitor.output_latency_ms = buffer * 1000 / frequency if frequency else 0
+        AVSyncMonitor.visuals = {}
+        AVSyncMonitor.sounds = {}
+        AVSyncMonitor.waiting = set()
+        AVSyncMonitor.offsets = []
+
+    # the picture shows with the next presented frame
+    @staticmethod
+    def visual_started(name):
+        if AVSyncMonitor.enabled:
+            AVSyncMonitor.visuals.pop(name, None)
+            AVSyncMonitor.waiting.add(name)
+
+    @staticmethod
+    def sound_started(name):
+        if AVSyncMonitor.enabled:
+            AVSyncMonitor.sounds[name] = time.perf_counter() * 1000 + AVSyncMonitor.output_latency_ms
+            AVSyncMonitor.match(name)
+
+    # the sound didn't play, forget the picture so it isn't matched with a later sound
+    @staticmethod
+    def discard(name):
+        if AVSyncMonitor.enabled:
+            AVSyncMonitor.visuals.pop(name, None)
+            AVSyncMonitor.sounds.pop(name, None)
+            AVSyncMonitor.waiting.discard(name)
+
+    @staticmethod
+    def frame_presented():
+        if not AVSyncMonitor.enabled or not AVSyncMonitor.waiting:
+            return
+        now = time.perf_counter() * 1000
+        for name in AVSyncMonitor.waiting:
+            AVSyncMonitor.visuals[name] = now
+            AVSyncMonitor.match(name)
+        AVSyncMonitor.waiting = set()
+
+    @staticmethod
+    def match(name):
+        if name in AVSyncMonitor.visuals and name in AVSyncMonitor.sounds:
+            offset = AVSyncMonitor.sounds.pop(name) - AVSyncMonitor.visuals.pop(name)
+            AVSyncMonitor.offsets.append(offset)
+            print(f"av sync {name}: sound {offset:+.1f} ms after picture "
+                  f"(output latency {AVSyncMonitor.output_latency_ms:.1f} ms)")
+
+    @staticmethod
+    def get_report():
+        offsets = AVSyncMonitor.offsets
+        if not offsets:
+            return "av sync: no measurements"
+        return (f"av sync: {len(offsets)} measurements, mean {sum(offsets) / len(offsets):+.1f} ms, "
+                f"min {min(offsets):+.1f} ms, max {max(offsets):+.1f} ms")
@@ -0,0 +1,26 @@
+"""
+This is a general purpose counter for surfaces created while the game runs.
+pygame_lib widgets count every surface they create (rendered text, button
+states, scaled images, ...), so code that creates surfaces on every frame
+shows up in the benchmark output.
+
+end_frame() is called once per frame by the game loop, last_frame holds the
+count of the frame that just ended.
+"""
+
+class Allocations:
+    frame = 0
+    last_frame = 0
+    total = 0
+    by_name = {}
+
+    @staticmethod
+    def add(name, count=1):
+        Allocations.frame += count
+        Allocations.total += count
+        Allocations.by_name[name] = Allocations.by_name.get(name, 0) + count
+
+    @staticmethod
+    def end_frame():
+        Allocations.last_frame = Allocations.frame
+        Allocations.frame = 0
@@ -0,0 +1,113 @@
+"""
+This is a general purpose background asset preloader. Images and sounds are
+decoded and fonts are read on worker threads, so the main thread can keep
+drawing frames while assets load.
+
+Font files are read into the FontCache. Sounds come from the SoundCache when
+they were decoded before.
+
+Images are decoded without convert(), which needs the display and has to run
+on the main thread. Utils.load_image takes a preloaded image if there is one
+(waiting for it if it is still decoding) and converts it.
+
+Preloading is off until start() is called. Requests made before that are
+ignored and the assets are loaded on the main thread as usual.
+"""
+import os
+import time
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+
+from .StartupReport import StartupReport
+from .FontCache import FontCache
+from .SoundCache import SoundCache
+
+class AssetPreloader:
+    executor = None
+    images = {}
+    sounds = {}
+
+    @staticmethod
+    def start(workers=1):
+        if AssetPreloader.executor is None:
+            AssetPreloader.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preloader")
+
+    @staticmethod
+    def stop():
+        if AssetPreloader.executor is not None:
+            AssetPreloader.executor.shutdown(wait=False, cancel_futures=True)
+            AssetPreloader.executor = None
+        AssetPreloader.images = {}
+        AssetPreloader.sounds = {}
+
+    @staticmethod
+    def request_image(path):
+        if AssetPreloader.executor is not None and path not in AssetPreloader.images:
+            AssetPreloader.images[path] = AssetPreloader.executor.submit(AssetPreloader._decode_image, path)
+
+    @staticmethod
+    def request_sound(path):
+        if AssetPreloader.executor is not None and path not in AssetPreloader.sounds:
+            AssetPreloader.sounds[path] = AssetPreloader.executor.submit(AssetPreloader._decode_sound, path)
+
+    @staticmethod
+    def request_font(path):
+        if AssetPreloader.executor is not None:
+            AssetPreloader.executor.submit(AssetPreloader._read_font, path)
+
+    # true if the image is decoded or was never requested
+    @staticmethod
+    def is_ready(path):
+        future = AssetPreloader.images.get(path)
+        return future is None or future.done()
+
+    # returns the decoded image and forgets it, None if it was not requested
+    @staticmethod
+    def take_image(path):
+        future = AssetPreloader.images.pop(path, None)
+        if future is None:
+            return None
+        return future.result()
+
+    # forgets a requested image that is not needed anymore
+    @staticmethod
+    def discard_image(path):
+        future = AssetPreloader.images.pop(path, None)
+        if future is not None:
+            future.cancel()
+
+    # returns the decoded sound, None if it was not requested
+    @staticmethod
+    def get_sound(path):
+        future = AssetPreloader.sounds.get(path)
+        if future is None:
+            return None
+        return future.result()
+
+
+    @staticmethod
+    def short_name(path):
+        # folder and file name, e.g. splash/chamber_44.jpg
+        folder, file_name = os.path.split(path)
+        return os.path.basename(folder) + "/" + file_name
+
+    @staticmethod
+    def _decode_image(path):
+        start = time.perf_counter()
+        image = pygame.image.load(path)
+        StartupReport.add("decode " + AssetPreloader.short_name(path), (time.perf_counter() - start) * 1000, "background")
+        return image
+
+    @staticmethod
+    def _decode_sound(path):
+        start = time.perf_counter()
+        sound = SoundCache.load_sound(path)
+        StartupReport.add("decode " + AssetPreloader.short_name(path), (time.perf_counter() - start) * 1000, "background")
+        return sound
+
+    @staticmethod
+    def _read_font(path):
+        # the font file is kept in memory by the font cache
+        start = time.perf_counter()
+        FontCache.load_file(path)
+        StartupReport.add("read " + AssetPreloader.short_name(path), (time.perf_counter() - start) * 1000, "background")
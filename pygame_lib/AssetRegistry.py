@@ -0,0 +1,83 @@
+"""
+This is a general purpose in-memory registry for loaded images. Images are
+kept by (path, size, alpha, flip), so screens and widgets that load the same
+image at the same size share one surface instead of decoding and scaling it
+again.
+
+The registry has a memory budget. When the images it holds get bigger than
+the budget, the least recently used ones are dropped. Widgets that still use a
+dropped image keep it, it is only loaded again the next time it is requested.
+
+Shared images must not be changed (set_alpha, blit onto, ...). Make a copy
+first if an image has to be changed.
+"""
+from collections import OrderedDict
+
+class AssetRegistry:
+    max_bytes = 0           # 0 means no limit
+    surfaces = OrderedDict()
+    bytes_held = 0
+    hits = 0
+    misses = 0
+    evictions = 0
+
+    # clears the registry, call after the display was created
+    @staticmethod
+    def configure(max_bytes):
+        AssetRegistry.max_bytes = max_bytes
+        AssetRegistry.clear()
+
+    @staticmethod
+    def clear():
+        AssetRegistry.surfaces = OrderedDict()
+        AssetRegistry.bytes_held = 0
+        AssetRegistry.hits = 0
+        AssetRegistry.misses = 0
+        AssetRegistry.evictions = 0
+
+    @staticmethod
+    def get_key(path, size=None, convert_alpha=False, flip=False):
+        return (path, size, convert_alpha, flip)
+
+    # returns the shared surface, or None if it has to be loaded
+    @staticmethod
+    def get(key):
+        surface = AssetRegistry.surfaces.get(key)
+        if surface is None:
+            AssetRegistry.misses += 1
+            return None
+
+        AssetRegistry.surfaces.move_to_end(key)
+        AssetRegistry.hits += 1
+        return surface
+
+    @staticmethod
+    def add(key, surface):
+        if key in AssetRegistry.surfaces:
+            AssetRegistry.bytes_held -= AssetRegistry.get_bytes(AssetRegistry.surfaces.pop(key))
+
+        AssetRegistry.surfaces[key] = surface
+        AssetRegistry.bytes_held += AssetRegistry.get_bytes(surface)
+        AssetRegistry.evict()
+
+    # drops the least recently used surfaces until the registry fits in max_bytes
+    # the newest surface is always kept, even if it is bigger than the budget
+    @staticmethod
+    def evict():
+        if AssetRegistry.max_bytes <= 0:
+            return
+        while AssetRegistry.bytes_held > AssetRegistry.max_bytes and len(AssetRegistry.surfaces) > 1:
+            _, surface = AssetRegistry.surfaces.popitem(last=False)
+            AssetRegistry.bytes_held -= AssetRegistry.get_bytes(surface)
+            AssetRegistry.evictions += 1
+
+    @staticmethod
+    def get_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    @staticmethod
+    def get_report():
+        return (f"asset registry: {len(AssetRegistry.surfaces)} images, "
+                f"{AssetRegistry.bytes_held / (1024 * 1024):.1f} MB held, "
+                f"{AssetRegistry.hits} hits, {AssetRegistry.misses} misses, "
+                f"{AssetRegistry.evictions} evicted")
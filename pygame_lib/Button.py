@@ -8,6 +8,11 @@ radius. The button can also play a sound when hovered over.
 """
 import pygame
 from .Fader import Fader
+from .DirtyRects import DirtyTracker
+from .FontCache import FontCache
+from .RenderQueue import RenderQueue
+from .Allocations import Allocations
+from .SoundBank import SoundBank
 
 class Button:
     # width and height of 0 means the button will be sized to fit the text
@@ -44,16 +49,20 @@ class Button:
         self.border_width = border_width
         self.play_sound = False
 
-        self.hover_sound = None
+        # the hover sound is loaded now, so the first hover doesn't wait for it
+        self.hover_sound_path = hover_sound_path
         if hover_sound_path != "":
-            self.hover_sound = pygame.mixer.Sound(hover_sound_path)
+            SoundBank.get(hover_sound_path)
             self.play_sound = True
 
-        self.font = pygame.font.Font(font_path, round(font_size))
+        self.font = FontCache.get_font(font_path, font_size)
 
+        self.hovered = False
         self.was_hovered = False
 
         self.fader = Fader(fps)
+        self.layer = RenderQueue.LAYER_UI
+        self.dirty = DirtyTracker()
         self.render()
 
 
@@ -75,9 +84,12 @@ class Button:
     def turn_sound_off(self):
         self.play_sound = False
 
+    # the mouse is tested once per frame for all widgets of a screen, see WidgetManager
+    def set_hovered(self, hovered):
+        self.hovered = hovered
+
     def is_hovered(self):
-        mouse_pos = pygame.mouse.get_pos()
-        return self.button_area.collidepoint(mouse_pos)
+        return self.hovered
 
     # draw a rounded rectangle with border
     def draw_rounded_rect(self,surface,
@@ -106,8 +118,7 @@ class Button:
 
 
     # separting render and draw
-    # render creates the button while draw displays it
-    # only if there is a change in hover state will the button be re-rendered
+    # render creates the normal and hover buttons once, draw displays one of them
     def render(self):
 
         # Rendering text surface
@@ -118,22 +129,29 @@ class Button:
         # width or height of 0 means auto; set to the width/height of the text + 10
         if self.w == 0: self.width = self.text_rect.width + 10
         if self.h == 0: self.height = self.text_rect.height + 10
-        self.button_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA, 32)
+        self.normal_surf = self.render_state(self.button_color)
+        self.hover_surf = self.render_state(self.hover_color)
+        Allocations.add("Button", 3)
+        self.button_surf = self.hover_surf if self.was_hovered else self.normal_surf
         self.button_rect = self.button_surf.get_rect()
 
         # x or y of -1 = centered on window
         if self.x == -1: self.x = self.window.get_width() // 2
         if self.y == -1: self.y = self.window.get_height() // 2
 
-        # check if hover in progress and select appropriate color
-        if self.is_hovered(): color_to_use = self.hover_color
-        else:                 color_to_use = self.button_color
+        # create screen area from button area and center on x,y
+        self.button_area = self.button_rect
+        self.button_area.center = (self.x, self.y)
+
+
+    def render_state(self, color_to_use):
+        button_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA, 32)
 
         # if radius is greater than 0, draw a rounded rectangle
         # else draw regular rectangle with border
         if self.border_radius > 0:
             # draw rounded rectangle with border
-            self.draw_rounded_rect(self.button_surf,
+            self.draw_rounded_rect(button_surf,
                                    # x,y,width,height
                                    0, 0, self.width,self.height,
                                    # color
@@ -145,34 +163,33 @@ class Button:
             # draw regular rectangle with border
             if self.border_width > 0:
                 # draw rectangle with border color
-                pygame.draw.rect(self.button_surf, self.border_color, self.button_surf.get_rect())
+                pygame.draw.rect(button_surf, self.border_color, button_surf.get_rect())
                 # draw rectangle with button color inside border
-                pygame.draw.rect(self.button_surf, color_to_use, self.button_surf.get_rect().inflate(-self.border_width*2, -self.border_width*2))
+                pygame.draw.rect(button_surf, color_to_use, button_surf.get_rect().inflate(-self.border_width*2, -self.border_width*2))
             else:
-                pygame.draw.rect(self.button_surf, color_to_use, self.button_surf.get_rect())
+                pygame.draw.rect(button_surf, color_to_use, button_surf.get_rect())
 
         # center text surface on button surface and blit
-        self.text_rect.center = self.button_rect.center
-        self.button_surf.blit(self.text_surf, self.text_rect)
-
-        # create screen area from button area and center on x,y
-        self.button_area = self.button_rect
-        self.button_area.center = (self.x, self.y)
+        self.text_rect.center = button_surf.get_rect().center
+        button_surf.blit(self.text_surf, self.text_rect)
+        return button_surf
 
 
 
     def draw (self):
 
-        # if change in hover re-render button
-        if (self.is_hovered() != self.was_hovered):
-            self.render()
-            if self.is_hovered() and self.play_sound:
-                pygame.mixer.find_channel().play(self.hover_sound)
-            self.was_hovered = not self.was_hovered
+        # if change in hover switch to the other pre-rendered button
+        hovered = self.is_hovered()
+        if hovered != self.was_hovered:
+            self.button_surf = self.hover_surf if hovered else self.normal_surf
+            if hovered and self.play_sound and self.hover_sound_path != "":
+                SoundBank.play(self.hover_sound_path, SoundBank.PRIORITY_LOW)
+            self.was_hovered = hovered
 
         alpha = self.fader.get_next_alpha()
         self.button_surf.set_alpha(alpha)
-        self.window.blit(self.button_surf, self.button_area.topleft)
+        rect = RenderQueue.submit(self.window, self.button_surf, self.button_area.topleft, self.layer)
+        self.dirty.update(rect, (alpha, self.was_hovered, self.text))
 
 
     def is_clicked(self, coords):
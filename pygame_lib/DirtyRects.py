@@ -0,0 +1,62 @@
+"""
+This is a general purpose dirty rectangle tracker. Widgets report the areas of
+the screen they changed during a frame and the game loop passes only those
+areas to pygame.display.update() instead of updating the whole screen.
+
+Tracking is opt-in. While it is disabled, adding rectangles does nothing and
+the game loop updates the full screen as usual.
+
+A full screen update can be requested at any time (for example while the
+screen fader is fading or when switching to another game screen).
+"""
+import pygame
+
+class DirtyRects:
+    enabled = False
+    full_update = True
+    rects = []
+
+    @staticmethod
+    def enable(enabled=True):
+        DirtyRects.enabled = enabled
+        DirtyRects.full_update = True
+        DirtyRects.rects = []
+
+    @staticmethod
+    def add(rect):
+        if DirtyRects.enabled and rect is not None and not DirtyRects.full_update:
+            DirtyRects.rects.append(pygame.Rect(rect))
+
+    @staticmethod
+    def add_full():
+        # request an update of the whole screen for this frame
+        DirtyRects.full_update = True
+        DirtyRects.rects = []
+
+    @staticmethod
+    def flush():
+        # returns the rects to update for this frame, or None for a full update
+        # and starts collecting for the next frame
+        rects = None if DirtyRects.full_update else DirtyRects.rects
+        DirtyRects.full_update = False
+        DirtyRects.rects = []
+        return rects
+
+
+# keeps the last drawn position and state of a widget and reports the old and
+# the new area as dirty whenever one of them changes
+class DirtyTracker:
+    def __init__(self):
+        self.rect = None
+        self.state = None
+
+    def update(self, rect, state=None):
+        if rect != self.rect or state != self.state:
+            DirtyRects.add(self.rect)
+            DirtyRects.add(rect)
+            self.rect = pygame.Rect(rect) if rect is not None else None
+            self.state = state
+
+    # widget is no longer drawn, erase its last area
+    def clear(self):
+        self.update(None)
@@ -2,12 +2,16 @@
 This is a general purpose fader class to keep track of an alpha value while
 progressing through the game loop. It can be used to fade in and out images,
 surfaces, text, etc.
+The alpha value is calculated from the time elapsed since the fade started
+(see GameClock), so a fade takes the same time at any frame rate.
 """
+from .GameClock import GameClock
 
 class Fader:
     def __init__(self, fps, startAlpha=255):
         # check that alpha value is between 0 and 255
         self.initial_alpha = max(0, min(255, int(startAlpha)))
+        # fps is no longer needed to step the fade, kept for existing callers
         self.fps = fps
         self.reset(self.initial_alpha)
 
@@ -17,43 +21,48 @@ class Fader:
         if startAlpha == -1: self.alpha = self.initial_alpha
         else:                self.alpha = startAlpha
 
+        self.start_alpha = self.alpha
         self.target_alpha = 0
-        self.alpha_step = 0
+        self.start_time = 0
+        self.duration = 0
         self.fade_in_started = False
         self.fade_in_ended = False
         self.fade_out_started = False
         self.fade_out_ended = False
 
     # fades in the alpha value of the fader
-    # duration is the time in seconds to fade out
-    # fps is the frames per second of the game
-    # startAlpha is the alpha value to start the fade out from
+    # duration is the time in seconds to fade in
+    # startAlpha is the alpha value to start the fade in from
     # if startAlpha is -1, the current alpha value is used
-    # targetAlpha is the alpha value to fade out to
-    def fade_in(self, duration, startAlpha=0, targetAlpha=255):
+    # targetAlpha is the alpha value to fade in to
+    # start_time is the GameClock time the fade starts at, now if it is None
+    def fade_in(self, duration, startAlpha=0, targetAlpha=255, start_time=None):
 
         if not self.fade_in_started:
             self.fade_in_started = True
             if startAlpha != -1:
                 self.alpha = startAlpha
-            self.target_alpha = targetAlpha
-            self.alpha_step = (abs(self.target_alpha - self.alpha)) / (duration * self.fps)
-            #self.alpha_step = 1 / (duration * self.fps)
+            self.start_fade(duration, targetAlpha, start_time)
 
     # fades out the alpha value of the fader
     # duration is the time in seconds to fade out
-    # fps is the frames per second of the game
     # startAlpha is the alpha value to start the fade out from
     # if startAlpha is -1, the current alpha value is used
     # targetAlpha is the alpha value to fade out to
-    def fade_out(self, duration, startAlpha=-1, targetAlpha=0):
+    # start_time is the GameClock time the fade starts at, now if it is None
+    def fade_out(self, duration, startAlpha=-1, targetAlpha=0, start_time=None):
 
         if not self.fade_out_started:
             self.fade_out_started = True
             if startAlpha != -1:
                 self.alpha = startAlpha
-            self.target_alpha = targetAlpha
-            self.alpha_step = -(abs(self.target_alpha - self.alpha)) / (duration * self.fps)
+            self.start_fade(duration, targetAlpha, start_time)
+
+    def start_fade(self, duration, targetAlpha, start_time=None):
+        self.start_alpha = self.alpha
+        self.target_alpha = targetAlpha
+        self.duration = duration
+        self.start_time = GameClock.now() if start_time is None else start_time
 
 
     def is_fading(self):
@@ -63,17 +72,22 @@ class Fader:
     def get_next_alpha(self):
 
         if self.is_fading():
-            self.alpha += self.alpha_step
-            self.alpha = max(0, min(255, int(self.alpha)))
+            GameClock.mark_animating()
+            progress = GameClock.progress(self.start_time, self.duration)
+            alpha = self.start_alpha + (self.target_alpha - self.start_alpha) * progress
+            self.alpha = max(0, min(255, int(alpha)))
 
-            if self.fade_in_started and self.alpha >= self.target_alpha:
-                self.fade_in_ended = True
-            if self.fade_out_started and self.alpha <= self.target_alpha:
-                self.fade_out_ended = True
+            if progress >= 1:
+                if self.fade_in_started:
+                    self.fade_in_ended = True
+                if self.fade_out_started:
+                    self.fade_out_ended = True
 
         return self.alpha
 
 
+    # sets the alpha value and holds it for the rest of a running fade
     def set_alpha(self, alpha):
         self.alpha = alpha
-        self.alpha_step = 0
\ No newline at end of file
+        self.start_alpha = alpha
+        self.target_alpha = alpha
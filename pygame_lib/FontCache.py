@@ -0,0 +1,50 @@
+"""
+This is a general purpose font cache. Each font file is read from disk once
+and kept in memory, and fonts are shared per file and size (rounded to whole
+pixels), so creating buttons and text lines does not touch the disk.
+
+file_loads counts how often a font file was read from disk and font_loads how
+often a pygame Font was created, they should stop growing once the screens
+are built.
+"""
+import io
+import threading
+import pygame
+
+class FontCache:
+    font_files = {}     # path -> bytes of the .ttf file
+    fonts = {}          # (path, size) -> pygame Font
+    file_loads = 0
+    font_loads = 0
+    lock = threading.Lock()
+
+    # reads the font file into memory, can be called from a worker thread
+    @staticmethod
+    def load_file(path):
+        with FontCache.lock:
+            data = FontCache.font_files.get(path)
+        if data is not None:
+            return data
+
+        with open(path, "rb") as font_file:
+            data = font_file.read()
+        with FontCache.lock:
+            if path not in FontCache.font_files:
+                FontCache.font_files[path] = data
+                FontCache.file_loads += 1
+            return FontCache.font_files[path]
+
+    @staticmethod
+    def get_font(path, size):
+        key = (path, round(size))
+        font = FontCache.fonts.get(key)
+        if font is None:
+            # every font reads from its own file object, they all share the bytes
+            font = pygame.font.Font(io.BytesIO(FontCache.load_file(path)), key[1])
+            FontCache.fonts[key] = font
+            FontCache.font_loads += 1
+        return font
+
+    @staticmethod
+    def get_report():
+        return f"font cache: {FontCache.file_loads} files read, {FontCache.font_loads} fonts created"
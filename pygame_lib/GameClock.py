@@ -0,0 +1,79 @@
+"""
+This is a shared clock for animations. The game loop calls tick() once at the
+start of every frame and all animations (faders, zoomers, screen faders) read
+the same frame time from now(). Animations are driven by the elapsed time since
+they started instead of a fixed step per frame, so they finish on time at any
+frame rate.
+Running animations mark the clock as animating, which lets the game loop
+lower the frame rate while nothing is animating.
+
+The clock is the time source for everything that waits or animates (Timer,
+Sprite, faders, the game screens). It follows the real time by default. It can
+run faster or slower with a time scale, or be virtual: then time only moves
+when advance() is called, so a scripted game can run as fast as the frames
+can be drawn.
+"""
+import pygame
+
+class GameClock:
+    frame_time = 0
+    frame_ticks = 0
+    animating = False
+
+    # time source, game time = base_time + real time since base_ticks * time_scale
+    time_scale = 1.0
+    virtual = False
+    virtual_time = 0
+    base_ticks = 0
+    base_time = 0
+
+    # time_scale 2 runs the game twice as fast, virtual time only moves with advance()
+    # the game time carries on from where it is, so running timers don't jump
+    @staticmethod
+    def configure(time_scale=1.0, virtual=False):
+        now = GameClock.get_time()
+        GameClock.base_ticks = pygame.time.get_ticks()
+        GameClock.base_time = now
+        GameClock.virtual_time = now
+        GameClock.time_scale = time_scale
+        GameClock.virtual = virtual
+
+    # moves virtual time forward by ms milliseconds
+    @staticmethod
+    def advance(ms):
+        GameClock.virtual_time += ms
+
+    # game time in milliseconds right now, use now() for the time of the frame
+    @staticmethod
+    def get_time():
+        if GameClock.virtual:
+            return GameClock.virtual_time
+        return GameClock.base_time + (pygame.time.get_ticks() - GameClock.base_ticks) * GameClock.time_scale
+
+    # call once per frame, before updating and drawing the screens
+    @staticmethod
+    def tick():
+        GameClock.frame_time = GameClock.get_time()
+        # real time of the frame, for the frame rate
+        GameClock.frame_ticks = pygame.time.get_ticks()
+        GameClock.animating = False
+        return GameClock.frame_time
+
+    # called by running animations (fades, zooms, pulses) every frame
+    @staticmethod
+    def mark_animating():
+        GameClock.animating = True
+
+    # time of the current frame in milliseconds
+    @staticmethod
+    def now():
+        return GameClock.frame_time
+
+    # progress of an animation from 0.0 (start) to 1.0 (end)
+    # start_time is in milliseconds, duration is in seconds
+    @staticmethod
+    def progress(start_time, duration):
+        if duration <= 0:
+            return 1.0
+        elapsed = GameClock.frame_time - start_time
+        return max(0.0, min(1.0, elapsed / (duration * 1000)))
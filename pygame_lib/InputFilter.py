@@ -0,0 +1,29 @@
+"""
+This is a general purpose input filter that sits between the event queue and
+the game screens. Event types the game does not use are blocked with
+pygame.event.set_allowed, so they never reach the queue. The mouse motion
+events of a frame are merged into one event with the latest mouse position,
+so a fast mouse or a touch panel does not flood the screens with motion events.
+"""
+import pygame
+
+class InputFilter:
+    def __init__(self, allowed_events):
+        self.allowed_events = list(allowed_events)
+
+        # block everything, then allow only the event types the game uses
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.allowed_events)
+
+    def filter(self, events):
+        # drop all mouse motion events of the frame except the last one
+        last_motion = None
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                last_motion = event
+
+        if last_motion is None:
+            return events
+
+        return [event for event in events
+                if event.type != pygame.MOUSEMOTION or event is last_motion]
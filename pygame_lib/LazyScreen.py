@@ -0,0 +1,37 @@
+"""
+This is a general purpose lazy screen class. A game screen is registered with
+a factory function that creates it, and the screen is only built the first
+time it is needed. The time it took to build the screen is kept so startup
+time can be reported per screen.
+
+Screens can link to a LazyScreen instead of the real screen. The game loop
+resolves it to the real screen when it switches to it.
+"""
+import time
+
+class LazyScreen:
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self._screen = None
+        self.build_time = 0
+
+    @property
+    def is_built(self):
+        return self._screen is not None
+
+    # returns the screen, building it on first use
+    @property
+    def screen(self):
+        if self._screen is None:
+            start = time.perf_counter()
+            self._screen = self.factory()
+            self.build_time = (time.perf_counter() - start) * 1000
+        return self._screen
+
+    # returns the real screen for a screen or a lazy screen
+    @staticmethod
+    def resolve(screen):
+        if isinstance(screen, LazyScreen):
+            return screen.screen
+        return screen
@@ -0,0 +1,165 @@
+"""
+This is a general purpose render queue. Instead of blitting to the screen
+right away, widgets submit their surfaces with a layer and the frame is drawn
+in one go with Surface.blits, layer by layer. Surfaces on the same layer are
+drawn in the order they were submitted.
+
+Surfaces that are completely off the screen are dropped, and so is everything
+below an opaque surface that covers the whole screen. covers_screen() tells
+the game loop if it can skip clearing the screen.
+
+The queue is only used between begin() and flush(). Outside of that, or when
+drawing to another surface, submit() blits right away, so widgets still work
+without a game loop that uses the queue.
+
+Surfaces shared by several widgets (like cached text) can be submitted with
+their own alpha. The alpha is set on the surface right before it is drawn, so
+each queued blit keeps the alpha it was submitted with.
+
+capture() sends everything submitted for a surface into an offscreen surface
+instead, with premultiplied alpha, so translucent widgets can be composited
+once and drawn later with a single blit (see StaticLayer).
+"""
+import pygame
+from contextlib import contextmanager
+
+from .Allocations import Allocations
+
+class RenderQueue:
+    # layers used by the game, lower layers are drawn first
+    LAYER_BACKGROUND = 0
+    LAYER_SCENE = 10
+    LAYER_UI = 20
+    LAYER_OVERLAY = 30
+
+    target = None
+    target_rect = None
+    items = []
+    cover_index = -1
+    cover_layer = -1
+
+    capture_source = None
+    capture_target = None
+
+    # counts of the last flushed frame
+    blit_count = 0
+    culled_count = 0
+
+    @staticmethod
+    def begin(target):
+        RenderQueue.target = target
+        RenderQueue.target_rect = target.get_rect()
+        RenderQueue.items = []
+        RenderQueue.cover_index = -1
+        RenderQueue.cover_layer = -1
+        RenderQueue.culled_count = 0
+
+    # queues a blit and returns the screen area it will cover, like blit does
+    # opaque surfaces (no alpha) covering the whole target hide everything below them
+    # alpha, if given, is the surface alpha used for this blit only
+    @staticmethod
+    def submit(target, surface, dest, layer=0, blend=0, area=None, alpha=None):
+        # the capture source is usually the queue target too, check it first
+        if target is RenderQueue.capture_source:
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            return RenderQueue.blit_premultiplied(surface, dest, area)
+        if target is not RenderQueue.target:
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            return target.blit(surface, dest, area, blend)
+
+        if area is None:
+            rect = pygame.Rect(dest[0], dest[1], surface.get_width(), surface.get_height())
+        else:
+            rect = pygame.Rect(dest[0], dest[1], area[2], area[3])
+        rect = rect.clip(RenderQueue.target_rect)
+
+        if rect.width == 0 or rect.height == 0:
+            RenderQueue.culled_count += 1
+            return rect
+
+        index = len(RenderQueue.items)
+        RenderQueue.items.append((layer, index, surface, dest, area, blend, alpha))
+
+        if (blend == 0 and layer >= RenderQueue.cover_layer
+                and rect == RenderQueue.target_rect
+                and RenderQueue.is_opaque(surface, alpha)):
+            RenderQueue.cover_index = index
+            RenderQueue.cover_layer = layer
+        return rect
+
+    # while capturing, surfaces submitted for source are drawn into target right away
+    # target must be a SRCALPHA surface the size of source, layers are ignored
+    @staticmethod
+    @contextmanager
+    def capture(source, target):
+        saved = (RenderQueue.capture_source, RenderQueue.capture_target)
+        RenderQueue.capture_source = source
+        RenderQueue.capture_target = target
+        try:
+            yield
+        finally:
+            RenderQueue.capture_source, RenderQueue.capture_target = saved
+
+    @staticmethod
+    def blit_premultiplied(surface, dest, area=None):
+        if area is not None:
+            surface = surface.subsurface(area)
+        alpha = surface.get_alpha()
+
+        # per pixel alpha times surface alpha, premultiplied
+        copy = surface.copy()
+        copy.set_alpha(255)
+        flat = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        flat.blit(copy, (0, 0))
+        if alpha is not None and alpha < 255:
+            flat.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+
+        Allocations.add("RenderQueue.capture", 3)
+        target = RenderQueue.capture_target
+        target.blit(flat.premul_alpha(), dest, special_flags=pygame.BLEND_PREMULTIPLIED)
+        return pygame.Rect(dest[0], dest[1], surface.get_width(), surface.get_height()).clip(target.get_rect())
+
+    # alpha is the alpha the surface is submitted with, None for its own alpha
+    @staticmethod
+    def is_opaque(surface, alpha=None):
+        if alpha is None:
+            alpha = surface.get_alpha()
+        return (not surface.get_flags() & pygame.SRCALPHA
+                and alpha in (None, 255)
+                and surface.get_colorkey() is None)
+
+    # true if the queued frame has an opaque surface covering the whole target
+    @staticmethod
+    def covers_screen():
+        return RenderQueue.cover_index >= 0
+
+    # draws the queued frame to the target in layer order
+    @staticmethod
+    def flush():
+        if RenderQueue.target is None:
+            return
+
+        items = sorted(RenderQueue.items)
+        if RenderQueue.cover_index >= 0:
+            # skip everything drawn before the surface that covers the screen
+            start = items.index(RenderQueue.items[RenderQueue.cover_index])
+            RenderQueue.culled_count += start
+            items = items[start:]
+
+        # blits go out in batches, a batch ends when a surface needs a different alpha
+        batch = []
+        for _, _, surface, dest, area, blend, alpha in items:
+            if alpha is not None and surface.get_alpha() != alpha:
+                if batch:
+                    RenderQueue.target.blits(batch, doreturn=False)
+                    batch = []
+                surface.set_alpha(alpha)
+            batch.append((surface, dest, area, blend))
+        if batch:
+            RenderQueue.target.blits(batch, doreturn=False)
+        RenderQueue.blit_count = len(items)
+
+        RenderQueue.target = None
+        RenderQueue.items = []
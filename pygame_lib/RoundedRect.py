@@ -7,6 +7,9 @@ specific width, height, border color, border width, and inside color.
 """
 import pygame
 from .Fader import Fader
+from .DirtyRects import DirtyTracker
+from .RenderQueue import RenderQueue
+from .Allocations import Allocations
 
 class RoundedRect:
     def __init__(self, window,
@@ -25,6 +28,13 @@ class RoundedRect:
         self.start_alpha = start_alpha
 
         self.fader = Fader(fps,start_alpha)
+        self.layer = RenderQueue.LAYER_UI
+        self.dirty = DirtyTracker()
+
+        # surfaces are rendered on the first draw
+        self.inside_surface = None
+        self.border_surface = None
+        self.rendered_size = None
 
 
     def fade_reset(self):
@@ -39,6 +49,20 @@ class RoundedRect:
         self.fader.fade_out(duration)
 
 
+    # renders the inside and the border once, the alpha is set on the surface
+    # so fading does not render again
+    def render(self):
+        self.inside_surface = pygame.Surface((self.width - 2 * self.border_width, self.height - 2 * self.border_width), pygame.SRCALPHA)
+        pygame.draw.rect(self.inside_surface, self.inside_color,
+                         (0, 0, self.width - 2 * self.border_width, self.height - 2 * self.border_width), border_radius=15)
+
+        self.border_surface = pygame.Surface((round(self.width), round(self.height)), pygame.SRCALPHA)
+        pygame.draw.rect(self.border_surface, self.border_color, (0, 0, round(self.width), round(self.height)), round(self.border_width), border_radius=15)
+
+        self.rendered_size = (self.width, self.height)
+        Allocations.add("RoundedRect", 2)
+
+
     def draw(self, window, x, y):
 
         alpha = self.fader.get_next_alpha()
@@ -48,29 +72,19 @@ class RoundedRect:
         # if (y == -1):
         #     y = self.window.get_height() // 2 - self.text_surface.get_height() // 2 + y_offset
 
-
-
-         # Create a temporary surface to draw the inside part with transparency
-        temp_surface = pygame.Surface((self.width - 2 * self.border_width, self.height - 2 * self.border_width), pygame.SRCALPHA)
+        if self.rendered_size != (self.width, self.height):
+            self.render()
 
         # Set transparency for the inside part
-        temp_surface.set_alpha(alpha)
+        self.inside_surface.set_alpha(alpha)
+        RenderQueue.submit(window, self.inside_surface, (x + self.border_width, y + self.border_width), self.layer)
 
-        # Draw the inner rounded rectangle on the temporary surface
-        pygame.draw.rect(temp_surface, self.inside_color,
-                         (0, 0, self.width - 2 * self.border_width, self.height - 2 * self.border_width), border_radius=15)
+        # the border is hidden while fading out
+        if not self.fader.fade_out_started:
+            RenderQueue.submit(window, self.border_surface, (round(x), round(y)-1), self.layer)
 
-        if self.fader.fade_out_started:
-            # Draw the border rounded rectangle on the main surface
-            pygame.draw.rect(temp_surface, self.border_color, (round(x), round(y), round(self.width), round(self.height)), round(self.border_width), border_radius=15)
-            # Blit the temporary surface onto the main surface
-            window.blit(temp_surface, (x + self.border_width, y + self.border_width))
-        else:
-            # Blit the temporary surface onto the main surface
-            window.blit(temp_surface, (x + self.border_width, y + self.border_width))
-
-            # Draw the border rounded rectangle on the main surface
-            pygame.draw.rect(window, self.border_color, (round(x), round(y)-1, round(self.width), round(self.height)), round(self.border_width), border_radius=15)
+        self.dirty.update(pygame.Rect(round(x), round(y)-1, round(self.width), round(self.height)+1),
+                          (alpha, self.fader.fade_out_started))
 
 
 
@@ -3,22 +3,33 @@ This is a general purpose screen fader class that can be used to fade the screen
 in and out. The class fades the whole screen by adding a surface overtop the
 existing screen and changing the alpha value of the surface.
 The surface can be any color, so you can fade to black, white, etc.
+The alpha value is calculated from the time elapsed since the fade started
+(see GameClock), so a fade takes the same time at any frame rate.
 """
 
 import pygame
+from .DirtyRects import DirtyRects
+from .GameClock import GameClock
+from .RenderQueue import RenderQueue
 
 class ScreenFader:
     def __init__(self, fps):
         self.screen = pygame.display.get_surface()
+        # fps is no longer needed to step the fade, kept for existing callers
         self.fps = fps
         self.fade_surface = pygame.Surface((self.screen.get_width(), self.screen.get_height() ))
         self.color = (0,0,0)    # default fade to, or fade from color
         self.fade_surface.fill(self.color)
+        self.was_fading = False
+        self.layer = RenderQueue.LAYER_OVERLAY
         self.reset()
 
     def reset(self):
         self.alpha = 0
-        self.alpha_step = 0
+        self.start_alpha = 0
+        self.target_alpha = 0
+        self.start_time = 0
+        self.duration = 0
 
         self.fade_in_started = False
         self.fade_in_completed = False
@@ -29,20 +40,23 @@ class ScreenFader:
         # fading in by fading out a black screen from full alpha to none
         if not self.fade_in_started and not self.fade_in_completed:
             self.fade_in_started = True
-            self.alpha_step = -255 / (duration * self.fps)
-            #self.alpha_step = -1 / (duration * self.fps)
-            self.alpha = 255
+            self.start_fade(duration, 255, 0)
             self.color = color
 
     def fade_out(self,duration=0.5, color=(0,0,0)):
         # fading out by fading in a black screen (no alpha to full)
         if not self.fade_out_started and not self.fade_out_completed:
             self.fade_out_started = True
-            self.alpha_step = 255 / (duration * self.fps)
-            #self.alpha_step = 1 / (duration * self.fps)
-            self.alpha = 0
+            self.start_fade(duration, 0, 255)
             self.color = color
 
+    def start_fade(self, duration, start_alpha, target_alpha):
+        self.alpha = start_alpha
+        self.start_alpha = start_alpha
+        self.target_alpha = target_alpha
+        self.duration = duration
+        self.start_time = GameClock.now()
+
     @property
     def fade_out_complete(self):
         return self.fade_out_completed
@@ -61,12 +75,23 @@ class ScreenFader:
 
 
     def draw(self):
-        if self.fade_in_progress or self.fade_out_progress:
-            self.fade_surface.set_alpha(self.alpha)
-            self.screen.blit(self.fade_surface, (0,0))
-
-            self.alpha += self.alpha_step
-            if self.fade_out_progress and self.alpha >= 255:
-                self.fade_out_completed = True
-            if self.fade_in_progress and self.alpha <= 0:
-                self.fade_in_completed = True
+        # the fader covers the whole screen, so the whole screen is updated
+        # while fading and once more on the first frame after the fade
+        fading = self.fade_in_progress or self.fade_out_progress
+        if fading or self.was_fading:
+            DirtyRects.add_full()
+        self.was_fading = fading
+
+        if fading:
+            GameClock.mark_animating()
+            progress = GameClock.progress(self.start_time, self.duration)
+            self.alpha = self.start_alpha + (self.target_alpha - self.start_alpha) * progress
+
+            self.fade_surface.set_alpha(round(self.alpha))
+            RenderQueue.submit(self.screen, self.fade_surface, (0,0), self.layer)
+
+            if progress >= 1:
+                if self.fade_out_progress:
+                    self.fade_out_completed = True
+                if self.fade_in_progress:
+                    self.fade_in_completed = True
@@ -0,0 +1,96 @@
+"""
+This is a general purpose bank of shared sounds. Every sound file is loaded
+once and the same Sound is handed to everyone that plays it, so ten buttons
+with the same hover sound hold one copy of it.
+
+preload() decodes sounds before they are played, on the AssetPreloader threads
+if it is running. Sounds decoded in the background are used when they are
+there. Decoded sounds are kept on disk by the SoundCache, if it is configured.
+
+play() plays sounds on a pool of reserved channels. Every sound is played with
+a priority. When all channels are busy the oldest sound with the lowest
+priority is stopped for the new one, a sound never stops a sound with a higher
+priority. So a hover sound can't keep a tile pulse from playing.
+"""
+import pygame
+
+from .AssetPreloader import AssetPreloader
+from .SoundCache import SoundCache
+
+class SoundBank:
+    # hover and click sounds, then game effects, then sounds that must play
+    PRIORITY_LOW = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_HIGH = 2
+
+    sounds = {}
+
+    # one entry per channel: (priority, start order) of the sound that was last played on it
+    channels = []
+    playing = []
+    play_count = 0
+    dropped = 0
+    stolen = 0
+
+    @staticmethod
+    def get(path):
+        sound = SoundBank.sounds.get(path)
+        if sound is None:
+            sound = AssetPreloader.get_sound(path)
+            if sound is None:
+                sound = SoundCache.load_sound(path)
+            SoundBank.sounds[path] = sound
+        return sound
+
+    @staticmethod
+    def preload(paths):
+        for path in paths:
+            if AssetPreloader.executor is not None:
+                AssetPreloader.request_sound(path)
+            else:
+                SoundBank.get(path)
+
+    @staticmethod
+    def clear():
+        SoundBank.sounds = {}
+
+    # reserves the channels, so pygame never hands them out through find_channel
+    @staticmethod
+    def configure(num_channels):
+        pygame.mixer.set_num_channels(num_channels)
+        pygame.mixer.set_reserved(num_channels)
+        SoundBank.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+        SoundBank.playing = [(0, 0)] * num_channels
+
+    # returns the channel the sound plays on, None if all channels play more important sounds
+    @staticmethod
+    def play(path, priority=PRIORITY_NORMAL):
+        if not SoundBank.channels:
+            SoundBank.configure(pygame.mixer.get_num_channels())
+
+        sound = SoundBank.get(path)
+        index = SoundBank.get_free_channel(priority)
+        if index is None:
+            SoundBank.dropped += 1
+            return None
+
+        channel = SoundBank.channels[index]
+        SoundBank.play_count += 1
+        SoundBank.playing[index] = (priority, SoundBank.play_count)
+        channel.play(sound)
+        return channel
+
+    @staticmethod
+    def get_free_channel(priority):
+        steal = None
+        for index, channel in enumerate(SoundBank.channels):
+            if not channel.get_busy():
+                return index
+            # oldest of the lowest priority sounds
+            if SoundBank.playing[index][0] <= priority and (steal is None or SoundBank.playing[index] < SoundBank.playing[steal]):
+                steal = index
+
+        if steal is not None:
+            SoundBank.stolen += 1
+            SoundBank.channels[steal].stop()
+        return steal
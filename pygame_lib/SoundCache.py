@@ -0,0 +1,140 @@
+"""
+This is a general purpose disk cache for decoded sounds. The samples of a
+decoded sound are stored in a raw file in the format the mixer plays, so the
+next time the sound is needed it is memory mapped and loaded with
+pygame.mixer.Sound(buffer=...), without decoding the ogg file again.
+
+Cache files are keyed by the source path, its modification time and size and
+the mixer frequency, sample format and channels, so changing a sound or the
+mixer settings creates new entries. The cache has a size limit, the least
+recently used files are deleted when it gets too big.
+
+The cache is off until configure() is called.
+"""
+import os
+import mmap
+import struct
+import hashlib
+import pygame
+
+class SoundCache:
+    cache_dir = None
+    max_bytes = 0
+    hits = 0
+    misses = 0
+
+    # file header: magic, frequency, sample format, channels
+    header = struct.Struct("<4siii")
+    magic = b"SND1"
+
+    @staticmethod
+    def configure(cache_dir, max_bytes):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            # cache is optional, the sounds are just decoded every time
+            SoundCache.cache_dir = None
+            return
+        SoundCache.cache_dir = cache_dir
+        SoundCache.max_bytes = max_bytes
+
+    @staticmethod
+    def get_cache_file(path, mixer_format):
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{mixer_format}"
+        return os.path.join(SoundCache.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pcm")
+
+    # returns the cached sound or decodes it and adds it to the cache
+    @staticmethod
+    def load_sound(path):
+        sound = SoundCache.load(path)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            SoundCache.save(path, sound)
+        return sound
+
+    # returns the cached sound, or None
+    @staticmethod
+    def load(path):
+        if SoundCache.cache_dir is None:
+            return None
+
+        mixer_format = pygame.mixer.get_init()
+        cache_file = SoundCache.get_cache_file(path, mixer_format)
+        try:
+            with open(cache_file, "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            SoundCache.misses += 1
+            return None
+
+        samples = None
+        try:
+            magic, frequency, sample_format, channels = SoundCache.header.unpack_from(buffer)
+            if magic != SoundCache.magic or (frequency, sample_format, channels) != mixer_format:
+                raise ValueError("not a sound cache file for this mixer")
+
+            # the sound copies the samples, after that the file can be closed
+            samples = memoryview(buffer)[SoundCache.header.size:]
+            sound = pygame.mixer.Sound(buffer=samples)
+        except (ValueError, struct.error, pygame.error):
+            # damaged or outdated cache file, it gets replaced on save
+            SoundCache.misses += 1
+            return None
+        finally:
+            if samples is not None:
+                samples.release()
+            buffer.close()
+
+        # touch the file so it counts as recently used
+        # another thread may have evicted it already, the sound is loaded anyway
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+        SoundCache.hits += 1
+        return sound
+
+    @staticmethod
+    def save(path, sound):
+        if SoundCache.cache_dir is None:
+            return
+
+        mixer_format = pygame.mixer.get_init()
+        cache_file = SoundCache.get_cache_file(path, mixer_format)
+        # the preloader threads save too, each one writes its own temp file
+        temp_file = f"{cache_file}.{os.getpid()}.{id(sound)}.tmp"
+        try:
+            with open(temp_file, "wb") as file:
+                file.write(SoundCache.header.pack(SoundCache.magic, *mixer_format))
+                file.write(sound.get_raw())
+            os.replace(temp_file, cache_file)
+        except OSError:
+            # cache is optional, a full or read-only disk just means no caching
+            return
+
+        SoundCache.evict()
+
+    # deletes the least recently used files until the cache fits in max_bytes
+    @staticmethod
+    def evict():
+        entries = []
+        total = 0
+        for file_name in os.listdir(SoundCache.cache_dir):
+            if not file_name.endswith(".pcm"):
+                continue
+            try:
+                stat = os.stat(os.path.join(SoundCache.cache_dir, file_name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_name))
+            total += stat.st_size
+
+        entries.sort()
+        while total > SoundCache.max_bytes and entries:
+            _, file_size, file_name = entries.pop(0)
+            try:
+                os.remove(os.path.join(SoundCache.cache_dir, file_name))
+            except OSError:
+                pass
+            total -= file_size
@@ -8,16 +8,20 @@ import math
 import pygame
 
 from .Utils import Utils
+from .DirtyRects import DirtyTracker
+from .RenderQueue import RenderQueue
+from .GameClock import GameClock
 
 class Sprite:
     def __init__(self, screen, image, frame_dimensions, num_frames, scale=1):
-        # Load the spritesheet
+        # Load the spritesheet, sprites using the same image share it
         self.spritesheet = Utils.load_image(image, True )
         # scale image to scale
         if scale != 1:
-            self.spritesheet = pygame.transform.scale(self.spritesheet,
-                                                     (int(self.spritesheet.get_width() * scale),
-                                                      int(self.spritesheet.get_height() * scale)))
+            self.spritesheet = Utils.load_image_to_fixed_size(image,
+                                                              int(self.spritesheet.get_width() * scale),
+                                                              int(self.spritesheet.get_height() * scale),
+                                                              True)
             self.frame_width = frame_dimensions[0] * scale
             self.frame_height = frame_dimensions[1] * scale
         else:
@@ -27,6 +31,8 @@ class Sprite:
         self.screen = screen
         self.frames = self.load_frames()
         self.frame_idx = -1
+        self.layer = RenderQueue.LAYER_SCENE
+        self.dirty = DirtyTracker()
 
     def load_frames(self):
         # Extract frames from the spritesheet
@@ -39,13 +45,14 @@ class Sprite:
 
     def animate(self, x, y, fps):
         # Update the frame index
-        # time.get_ticks() returns the number of milliseconds since the program started
+        # GameClock.now() is the time of the frame in milliseconds
         # // (1000 // fps) is the number of milliseconds per frame
         # independent frame rate
-        self.frame_idx = (pygame.time.get_ticks() // (1000 // fps)) % len(self.frames)
+        self.frame_idx = int(GameClock.now() // (1000 // fps)) % len(self.frames)
         self.frame_idx = (self.frame_idx + 1) % self.num_frames
         # Draw the current frame
-        self.screen.blit(self.frames[self.frame_idx], (x, y))
+        rect = RenderQueue.submit(self.screen, self.frames[self.frame_idx], (x, y), self.layer)
+        self.dirty.update(rect, self.frame_idx)
 
 # Usage example outside of the class
 # def main():
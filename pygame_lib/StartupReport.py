@@ -0,0 +1,93 @@
+"""
+This is a general purpose startup report. It records how long each startup
+step took (pygame.init, loading music, building screens, decoding images, ...)
+and when the first frame was shown, measured from the start of the process.
+
+Steps can be recorded from any thread. The report is printed once when
+startup is complete.
+"""
+import time
+import threading
+from contextlib import contextmanager
+
+class StartupReport:
+    start_time = time.perf_counter()
+    budget = 0
+    enabled = True
+    steps = []
+    marks = []
+    lock = threading.Lock()
+
+    # start_time is a time.perf_counter() value taken when the process started
+    @staticmethod
+    def begin(start_time=None, budget=0):
+        if start_time is not None:
+            StartupReport.start_time = start_time
+        StartupReport.budget = budget
+        StartupReport.enabled = True
+        StartupReport.steps = []
+        StartupReport.marks = []
+
+    # milliseconds since the process started
+    @staticmethod
+    def elapsed():
+        return (time.perf_counter() - StartupReport.start_time) * 1000
+
+    @staticmethod
+    def add(name, duration, category="main"):
+        if not StartupReport.enabled:
+            return
+        with StartupReport.lock:
+            StartupReport.steps.append((name, duration, category))
+
+    # times the code inside the with block
+    @staticmethod
+    @contextmanager
+    def measure(name, category="main"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            StartupReport.add(name, (time.perf_counter() - start) * 1000, category)
+
+    # remembers when something happened, e.g. the first frame
+    @staticmethod
+    def mark(name):
+        if not StartupReport.enabled:
+            return
+        with StartupReport.lock:
+            StartupReport.marks.append((name, StartupReport.elapsed()))
+
+    @staticmethod
+    def get_mark(name):
+        for mark_name, at in StartupReport.marks:
+            if mark_name == name:
+                return at
+        return None
+
+    # prints the report and stops recording
+    @staticmethod
+    def finish(show=True):
+        if not StartupReport.enabled:
+            return
+        StartupReport.enabled = False
+        if show:
+            StartupReport.print()
+
+    @staticmethod
+    def print():
+        print("startup report (ms)")
+        for category in ("main", "background"):
+            steps = [step for step in StartupReport.steps if step[2] == category]
+            if steps:
+                print(f"  {category} thread:")
+            for name, duration, _ in steps:
+                print(f"    {duration:8.1f}  {name}")
+
+        for name, at in StartupReport.marks:
+            print(f"  {name} at {at:.1f} ms")
+
+        first_frame = StartupReport.get_mark("first frame")
+        if StartupReport.budget > 0 and first_frame is not None:
+            status = "ok" if first_frame <= StartupReport.budget else "OVER BUDGET"
+            print(f"  first frame budget {StartupReport.budget} ms: {status}")
@@ -0,0 +1,57 @@
+"""
+This is a general purpose cached layer for widgets that don't change from
+frame to frame, like headings or an instructions box. The widgets are drawn
+once into an offscreen surface and after that the layer is drawn with a single
+blit until it is invalidated.
+
+Widgets are drawn into the layer inside a capture() with block, with their
+normal draw methods. The layer keeps only the area the widgets covered. If
+nothing reached the layer it stays invalid, so users can draw the widgets
+directly instead and the next capture tries again.
+"""
+import pygame
+from contextlib import contextmanager
+
+from .RenderQueue import RenderQueue
+from .DirtyRects import DirtyTracker
+from .Allocations import Allocations
+
+class StaticLayer:
+    def __init__(self, window, layer=RenderQueue.LAYER_UI):
+        self.window = window
+        self.layer = layer
+        self.surface = None
+        self.rect = None
+        self.dirty = DirtyTracker()
+
+    @property
+    def is_valid(self):
+        return self.surface is not None
+
+    # the widgets are drawn again on the next capture
+    def invalidate(self):
+        self.surface = None
+
+    # widgets drawn to the window inside the with block are drawn into the layer
+    @contextmanager
+    def capture(self):
+        surface = pygame.Surface(self.window.get_size(), pygame.SRCALPHA)
+        Allocations.add("StaticLayer", 2)
+        with RenderQueue.capture(self.window, surface):
+            yield
+
+        # keep only the area with something in it
+        rect = surface.get_bounding_rect()
+        if rect.width == 0 or rect.height == 0:
+            # nothing was captured, don't cache an empty layer
+            self.surface = None
+            self.rect = None
+            return
+        self.rect = rect
+        self.surface = surface.subsurface(self.rect).copy()
+
+    def draw(self):
+        # the layer has premultiplied alpha
+        rect = RenderQueue.submit(self.window, self.surface, self.rect.topleft,
+                                  self.layer, pygame.BLEND_PREMULTIPLIED)
+        self.dirty.update(rect, id(self.surface))
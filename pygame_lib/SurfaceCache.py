@@ -0,0 +1,148 @@
+"""
+This is a general purpose disk cache for decoded and scaled images. The pixels
+of a scaled image are stored in a raw file, so the next time the same image is
+needed at the same size it is memory mapped and loaded with
+pygame.image.frombuffer, without decoding the jpg/png file or scaling it again.
+
+Cache files are keyed by the source path, its modification time and size, the
+target size and the alpha mode, so changing an image or the screen size creates
+new entries. The cache has a size limit, the least recently used files are
+deleted when it gets too big.
+
+The cache is off until configure() is called.
+"""
+import os
+import mmap
+import struct
+import hashlib
+import pygame
+
+class SurfaceCache:
+    cache_dir = None
+    max_bytes = 0
+    hits = 0
+    misses = 0
+
+    # file header: magic, width, height, pixel format
+    header = struct.Struct("<4sII4s")
+    magic = b"SURF"
+
+    @staticmethod
+    def configure(cache_dir, max_bytes):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            # cache is optional, the images are just decoded and scaled every time
+            SurfaceCache.cache_dir = None
+            return
+        SurfaceCache.cache_dir = cache_dir
+        SurfaceCache.max_bytes = max_bytes
+
+    @staticmethod
+    def get_cache_file(path, size, convert_alpha):
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}|{convert_alpha}"
+        return os.path.join(SurfaceCache.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".surf")
+
+    @staticmethod
+    def contains(path, size, convert_alpha=False):
+        if SurfaceCache.cache_dir is None:
+            return False
+        return os.path.exists(SurfaceCache.get_cache_file(path, size, convert_alpha))
+
+    # returns the cached image converted for the display, or None
+    # size is the requested (width, height), 0 means keep the aspect ratio
+    @staticmethod
+    def load(path, size, convert_alpha=False):
+        if SurfaceCache.cache_dir is None:
+            return None
+
+        cache_file = SurfaceCache.get_cache_file(path, size, convert_alpha)
+        try:
+            with open(cache_file, "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            SurfaceCache.misses += 1
+            return None
+
+        pixels = None
+        mapped_image = None
+        try:
+            magic, width, height, pixel_format = SurfaceCache.header.unpack_from(buffer)
+            if magic != SurfaceCache.magic:
+                raise ValueError("not a surface cache file")
+
+            pixels = memoryview(buffer)[SurfaceCache.header.size:]
+            mapped_image = pygame.image.frombuffer(pixels, (width, height), pixel_format.rstrip(b"\0").decode())
+            # convert copies the pixels, after that the file can be closed
+            if convert_alpha: image = mapped_image.convert_alpha()
+            else:             image = mapped_image.convert()
+        except (ValueError, struct.error, pygame.error):
+            # damaged or outdated cache file, it gets replaced on save
+            SurfaceCache.misses += 1
+            return None
+        finally:
+            # the mapped surface holds on to the pixels, drop it before releasing them
+            mapped_image = None
+            if pixels is not None:
+                pixels.release()
+            buffer.close()
+
+        # touch the file so it counts as recently used
+        # it may have been evicted already, the image is loaded anyway
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+        SurfaceCache.hits += 1
+        return image
+
+    @staticmethod
+    def save(path, size, convert_alpha, image):
+        if SurfaceCache.cache_dir is None:
+            return
+
+        pixel_format = "RGBA" if convert_alpha else "RGB"
+        cache_file = SurfaceCache.get_cache_file(path, size, convert_alpha)
+        temp_file = cache_file + ".tmp"
+        try:
+            with open(temp_file, "wb") as file:
+                file.write(SurfaceCache.header.pack(SurfaceCache.magic, image.get_width(), image.get_height(),
+                                                    pixel_format.encode().ljust(4, b"\0")))
+                file.write(pygame.image.tobytes(image, pixel_format))
+            os.replace(temp_file, cache_file)
+        except OSError:
+            # cache is optional, a full or read-only disk just means no caching
+            return
+
+        SurfaceCache.evict()
+
+    # deletes the least recently used files until the cache fits in max_bytes
+    @staticmethod
+    def evict():
+        entries = []
+        total = 0
+        try:
+            file_names = os.listdir(SurfaceCache.cache_dir)
+        except OSError:
+            # the cache folder was deleted, nothing to evict
+            return
+        for file_name in file_names:
+            if not file_name.endswith(".surf"):
+                continue
+            # the file may be gone already, cleaned up or evicted by another instance
+            try:
+                stat = os.stat(os.path.join(SurfaceCache.cache_dir, file_name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_name))
+            total += stat.st_size
+
+        entries.sort()
+        while total > SurfaceCache.max_bytes and entries:
+            _, file_size, file_name = entries.pop(0)
+            try:
+                os.remove(os.path.join(SurfaceCache.cache_dir, file_name))
+            except OSError:
+                pass
+            total -= file_size
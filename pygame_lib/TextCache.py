@@ -0,0 +1,47 @@
+"""
+This is a general purpose cache for rendered text. Text is rendered once per
+(font, size, text, color, shadow) and the shadow is drawn into the same
+surface, so drawing a text line with a shadow is a single blit.
+
+The surfaces are shared. Users that fade text pass their alpha to
+RenderQueue.submit, like TextLine does, instead of setting it on the surface.
+"""
+import pygame
+from collections import OrderedDict
+
+from .FontCache import FontCache
+from .Allocations import Allocations
+
+class TextCache:
+    max_entries = 256
+    surfaces = OrderedDict()
+    hits = 0
+    misses = 0
+
+    # returns the text with its shadow shifted by shadow_offset to the bottom right
+    @staticmethod
+    def render(font_path, font_size, text, color, shadow_offset=0, shadow_color=(0,0,0)):
+        key = (font_path, round(font_size), text, tuple(color), shadow_offset, tuple(shadow_color))
+        surface = TextCache.surfaces.get(key)
+        if surface is not None:
+            TextCache.surfaces.move_to_end(key)
+            TextCache.hits += 1
+            return surface
+
+        TextCache.misses += 1
+        Allocations.add("TextCache", 3 if shadow_offset > 0 else 1)
+        font = FontCache.get_font(font_path, font_size)
+        text_surface = font.render(text, True, color)
+        if shadow_offset > 0:
+            shadow_surface = font.render(text, True, shadow_color)
+            surface = pygame.Surface((text_surface.get_width() + shadow_offset,
+                                      text_surface.get_height() + shadow_offset), pygame.SRCALPHA)
+            surface.blit(shadow_surface, (shadow_offset, shadow_offset))
+            surface.blit(text_surface, (0, 0))
+        else:
+            surface = text_surface
+
+        TextCache.surfaces[key] = surface
+        if len(TextCache.surfaces) > TextCache.max_entries:
+            TextCache.surfaces.popitem(last=False)
+        return surface
@@ -4,9 +4,15 @@ the screen. The text can be faded in and out. The text can be drawn at a
 specific x,y coordinate or centered on the screen. The text can have a shadow
 with a specific offset and color. The text can have a specific color, font,
 and font size. The text can be faded in and out.
+
+The rendered text comes from the TextCache, set_text only renders again if
+the text changed.
 """
 import pygame
 from .Fader import Fader
+from .DirtyRects import DirtyTracker
+from .TextCache import TextCache
+from .RenderQueue import RenderQueue
 
 
 class TextLine:
@@ -20,24 +26,32 @@ class TextLine:
         self.text_surface = None
 
         self.color = color
-        self.font = pygame.font.Font(font_path, round(font_size))
+        self.font_path = font_path
+        self.font_size = round(font_size)
 
-        self.shadow_surface = None
         self.shadow_offset = shadow_offset
         self.shadow_color = shadow_color
 
         self.fader = Fader(fps,startAlpha)
+        self.layer = RenderQueue.LAYER_UI
+        self.dirty = DirtyTracker()
         self._render()
 
 
     def _render(self):
+        # text and shadow in one surface
+        self.text_surface = TextCache.render(self.font_path, self.font_size, self.text,
+                                             self.color, self.shadow_offset, self.shadow_color)
+
+        # size of the text without the shadow
+        self.rect = pygame.Rect(0, 0, self.text_surface.get_width() - self.shadow_offset,
+                                self.text_surface.get_height() - self.shadow_offset)
 
-        if self.shadow_offset > 0:
-            self.shadow_surface = self.font.render(self.text, True, self.shadow_color)
-            self.shadow_rect = self.shadow_surface.get_rect()
 
-        self.text_surface = self.font.render(self.text, True, self.color)
-        self.rect = self.text_surface.get_rect()
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self._render()
 
 
 
@@ -58,16 +72,15 @@ class TextLine:
         alpha = self.fader.get_next_alpha()
 
         if (x == -1):
-            x = self.window.get_width() // 2 - self.text_surface.get_width() // 2 + x_offset
+            x = self.window.get_width() // 2 - self.rect.width // 2 + x_offset
         if (y == -1):
-            y = self.window.get_height() // 2 - self.text_surface.get_height() // 2 + y_offset
+            y = self.window.get_height() // 2 - self.rect.height // 2 + y_offset
 
-        if self.shadow_offset > 0:
-            self.shadow_surface.set_alpha(alpha)
-            self.window.blit(self.shadow_surface, (x + self.shadow_offset, y + self.shadow_offset))
+        # the surface is shared, the queue sets the alpha for this blit only
+        rect = RenderQueue.submit(self.window, self.text_surface, (x,y), self.layer, alpha=alpha)
 
-        self.text_surface.set_alpha(alpha)
-        self.window.blit(self.text_surface, (x,y))
+        # text area including the shadow
+        self.dirty.update(rect, (alpha, self.text))
 
 
 
@@ -0,0 +1,52 @@
+"""
+This is a general purpose timeline of events. Events are added up front as
+(item, start_ms, duration_ms), with the start relative to the start of the
+timeline, and played against the shared GameClock. get_due() returns the
+events that are due, each one once, so events happen on time no matter how
+long each frame takes. A late frame gets all events it missed, with the time
+they should have started, so animations can catch up.
+"""
+from .GameClock import GameClock
+
+class Timeline:
+    def __init__(self):
+        self.events = []
+        self.start_time = None
+        self.next_index = 0
+
+    def add(self, item, start_ms, duration_ms):
+        self.events.append((item, start_ms, duration_ms))
+        self.events.sort(key=lambda event: event[1])
+
+    # time the timeline started, the current frame time if not given
+    def start(self, start_time=None):
+        self.start_time = GameClock.now() if start_time is None else start_time
+        self.next_index = 0
+
+    @property
+    def is_started(self):
+        return self.start_time is not None
+
+    # length of the timeline in ms, up to the end of the last event
+    @property
+    def length(self):
+        return max((start_ms + duration_ms for _, start_ms, duration_ms in self.events), default=0)
+
+    def get_elapsed_time(self):
+        if self.start_time is None:
+            return 0
+        return GameClock.now() - self.start_time
+
+    # returns the events that are due and were not returned yet,
+    # as (item, start time, duration_ms) with the start time on the GameClock
+    def get_due(self):
+        due = []
+        elapsed = self.get_elapsed_time()
+        while self.next_index < len(self.events) and self.events[self.next_index][1] <= elapsed:
+            item, start_ms, duration_ms = self.events[self.next_index]
+            due.append((item, self.start_time + start_ms, duration_ms))
+            self.next_index += 1
+        return due
+
+    def is_finished(self):
+        return self.is_started and self.get_elapsed_time() >= self.length
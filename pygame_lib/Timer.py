@@ -1,14 +1,15 @@
 """
 This is a general purpose Timer class to measure elapsed time in milliseconds.
+The time comes from the GameClock, so timers follow its time scale.
 """
-import pygame
+from .GameClock import GameClock
 
 class Timer:
     def __init__(self):
-        self.start_ticks = pygame.time.get_ticks()  # Store the initial ticks
+        self.start_ticks = GameClock.get_time()  # Store the initial ticks
 
     def restart(self):
-        self.start_ticks = pygame.time.get_ticks()  # Reset the start time
+        self.start_ticks = GameClock.get_time()  # Reset the start time
 
     def get_elapsed_time(self):
-        return pygame.time.get_ticks() - self.start_ticks  # Calculate elapsed time in ms
+        return GameClock.get_time() - self.start_ticks  # Calculate elapsed time in ms
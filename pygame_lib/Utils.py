@@ -13,7 +13,7 @@ The class contains functions to
 - draw a centered image with a fixed width,
 - get the top left x,y coordinates for a centered area,
 - draw a rounded rectangle,
-- load an image,
+- load an image (shared through the AssetRegistry),
 - load an image to a fixed size,
 - load an image to a fixed height,
 - load an image to a fixed width,
@@ -24,6 +24,13 @@ The class contains functions to
 import os
 import pygame, random
 
+from .AssetPreloader import AssetPreloader
+from .StartupReport import StartupReport
+from .SurfaceCache import SurfaceCache
+from .AssetRegistry import AssetRegistry
+from .FontCache import FontCache
+from .Allocations import Allocations
+
 class Utils:
     @staticmethod
     def get_random_file_from_path(path, return_path=False, masks=['.jpg','.jpeg','.png'] ):
@@ -51,8 +58,9 @@ class Utils:
     @staticmethod
     def get_text_surface(text, color, font_size, font_path):
         #font = pygame.font.SysFont(font_name, font_size)
-        font = pygame.font.Font(font_path, font_size)
+        font = FontCache.get_font(font_path, font_size)
         text_surface = font.render(text, True, color)
+        Allocations.add("Utils.get_text_surface")
         return text_surface
 
     @staticmethod
@@ -140,28 +148,81 @@ class Utils:
     # Example usage:
     # draw_rounded_rect(screen, (50, 50, 100, 50), (0, 0^, 255), 10, 5, (255, 0, 0))
 
+    # loaded images are shared, don't change them (set_alpha, blit onto, ...)
     @staticmethod
     def load_image (image_path, convert_alpha=False):
+        key = AssetRegistry.get_key(image_path, None, convert_alpha)
+        img = AssetRegistry.get(key)
+        if img is None:
+            img = Utils.decode_image(image_path, convert_alpha)
+            AssetRegistry.add(key, img)
+        return img
+
+    @staticmethod
+    def decode_image (image_path, convert_alpha=False):
+        # use the image decoded in the background if it was preloaded
+        img = AssetPreloader.take_image(image_path)
+        if img is None:
+            with StartupReport.measure("decode " + AssetPreloader.short_name(image_path)):
+                img = pygame.image.load(image_path)
+
         if convert_alpha:
-            img = pygame.image.load(image_path).convert_alpha()
+            img = img.convert_alpha()
         else:
-            img = pygame.image.load(image_path).convert()
+            img = img.convert()
+        Allocations.add("Utils.load_image")
         return img
 
+    # loads an image scaled to width and height, 0 keeps the aspect ratio
+    # flip mirrors the image horizontally
+    # scaled images are shared through the AssetRegistry and kept in the disk cache (see SurfaceCache)
+    @staticmethod
+    def load_scaled_image (path, width, height, convert_alpha=False, flip=False):
+        key = AssetRegistry.get_key(path, (width, height), convert_alpha, flip)
+        img = AssetRegistry.get(key)
+        if img is None:
+            if flip:
+                img = pygame.transform.flip(Utils.load_scaled_image(path, width, height, convert_alpha), True, False)
+                Allocations.add("Utils.flip_image")
+            else:
+                img = Utils.scale_image(path, width, height, convert_alpha)
+            AssetRegistry.add(key, img)
+        return img
+
+    @staticmethod
+    def scale_image (path, width, height, convert_alpha=False):
+        size = (width, height)
+        img = SurfaceCache.load(path, size, convert_alpha)
+        if img is not None:
+            # not needed anymore if it was preloaded
+            AssetPreloader.discard_image(path)
+            return img
+
+        img = Utils.decode_image(path, convert_alpha)
+        if width == 0:  width = img.get_width() * height // img.get_height()
+        if height == 0: height = img.get_height() * width // img.get_width()
+        img = pygame.transform.scale(img, (width, height))
+        Allocations.add("Utils.scale_image")
+
+        SurfaceCache.save(path, size, convert_alpha, img)
+        return img
+
+    # true if the scaled image can be loaded from the disk cache
+    @staticmethod
+    def is_scaled_image_cached (path, width, height, convert_alpha=False):
+        return SurfaceCache.contains(path, (width, height), convert_alpha)
+
     @staticmethod
     def load_image_to_fixed_size (path, width, height, convert_alpha=False):
-        img = Utils.load_image(path, convert_alpha)
-        return pygame.transform.scale(img, (width, height))
+        return Utils.load_scaled_image(path, width, height, convert_alpha)
 
     @staticmethod
     def load_image_to_fixed_height (path, height, convert_alpha=False):
-        img = Utils.load_image(path, convert_alpha)
-        return pygame.transform.scale(img, (img.get_width() * height // img.get_height(), height))
+        return Utils.load_scaled_image(path, 0, height, convert_alpha)
 
     @staticmethod
-    def load_image_to_fixed_width (path, width, convert_alpha=False):
-        img = Utils.load_image(path, convert_alpha)
-        return pygame.transform.scale(img, (width, img.get_height() * width // img.get_width()))
+    def load_image_to_fixed_width (path, width, convert_alpha=False, flip=False):
+        return Utils.load_scaled_image(path, width, 0, convert_alpha, flip)
 
 
     @staticmethod
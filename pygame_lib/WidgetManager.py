@@ -0,0 +1,88 @@
+"""
+This is a general purpose manager for the interactive widgets of a screen.
+The screen adds its widgets with their screen area and a click callback, and
+calls update() once per frame. update() reads the mouse position once, tells
+the widget under the mouse that it is hovered and calls the click callback of
+the widget that was clicked.
+
+The areas are kept in a grid, so finding the widget under the mouse only looks
+at the widgets in one grid cell, no matter how many widgets the screen has.
+Widgets added later are on top.
+"""
+import pygame
+
+class WidgetManager:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.grid = {}
+        self.widgets = {}
+        self.order = 0
+        self.mouse_pos = (-1, -1)
+        self.hovered = None
+
+    # the area is copied, add the widget again if it moves
+    # widgets with a set_hovered(hovered) method are told when the mouse is over them
+    def add(self, widget, rect, on_click=None):
+        self.remove(widget)
+        rect = pygame.Rect(rect)
+        cells = self.get_cells(rect)
+        self.order += 1
+        self.widgets[widget] = (rect, on_click, cells, self.order)
+        for cell in cells:
+            self.grid.setdefault(cell, []).append(widget)
+
+    def remove(self, widget):
+        entry = self.widgets.pop(widget, None)
+        if entry is None:
+            return
+        for cell in entry[2]:
+            self.grid[cell].remove(widget)
+            if not self.grid[cell]:
+                del self.grid[cell]
+        if self.hovered is widget:
+            self.set_hovered(None)
+
+    def clear(self):
+        self.set_hovered(None)
+        self.grid = {}
+        self.widgets = {}
+
+    def get_cells(self, rect):
+        size = self.cell_size
+        return [(cx, cy)
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1)
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    # returns the top widget at pos, None if there is none
+    def widget_at(self, pos):
+        cell = (pos[0] // self.cell_size, pos[1] // self.cell_size)
+        top = None
+        top_order = 0
+        for widget in self.grid.get(cell, ()):
+            rect, _, _, order = self.widgets[widget]
+            if order > top_order and rect.collidepoint(pos):
+                top = widget
+                top_order = order
+        return top
+
+    def set_hovered(self, widget):
+        if widget is self.hovered:
+            return
+        if self.hovered is not None and hasattr(self.hovered, "set_hovered"):
+            self.hovered.set_hovered(False)
+        self.hovered = widget
+        if widget is not None and hasattr(widget, "set_hovered"):
+            widget.set_hovered(True)
+
+    # resolves hover and clicks for the frame, call it once per frame
+    def update(self, events):
+        self.mouse_pos = pygame.mouse.get_pos()
+        self.set_hovered(self.widget_at(self.mouse_pos))
+
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                widget = self.widget_at(event.pos)
+                if widget is not None:
+                    on_click = self.widgets[widget][1]
+                    if on_click is not None:
+                        on_click()
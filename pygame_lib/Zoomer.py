@@ -2,12 +2,16 @@
 This is a general purpose class to keep track of a zoom value while
 progressing through the game loop. It can be used to zoom in and out images,
 surfaces, text, etc.
+The zoom value is calculated from the time elapsed since the zoom started
+(see GameClock), so a zoom takes the same time at any frame rate.
 """
+from .GameClock import GameClock
 
 class Zoomer:
     def __init__(self, fps, startZoom=100):
         # check that zoom value is between 0 and 100
         self.initial_zoom = max(0, min(100, startZoom))
+        # fps is no longer needed to step the zoom, kept for existing callers
         self.fps = fps
         self.reset()
 
@@ -17,32 +21,30 @@ class Zoomer:
         if startZoom == -1: self.zoom = self.initial_zoom
         else:               self.zoom = startZoom
 
+        self.start_zoom = self.zoom
         self.target_zoom = 0
-        self.zoom_step = 0
+        self.start_time = 0
+        self.duration = 0
         self.zoom_in_started = False
         self.zoom_in_ended = False
         self.zoom_out_started = False
         self.zoom_out_ended = False
 
     # zooms into the zoom value of the Shrinker
-    # duration is the time in seconds to zoom out
-    # fps is the frames per second of the game
-    # startZoom is the zoom value to start the zoom out from
+    # duration is the time in seconds to zoom in
+    # startZoom is the zoom value to start the zoom in from
     # if startZoom is -1, the current zoom value is used
-    # targetZoom is the zoom value to zoom out to
+    # targetZoom is the zoom value to zoom in to
     def zoom_in(self, duration, startZoom=0, targetZoom=100):
 
         if not self.zoom_in_started:
             self.zoom_in_started = True
             if startZoom != -1:
                 self.zoom = startZoom
-            self.target_zoom = targetZoom
-            self.zoom_step = (abs(self.target_zoom - self.zoom)) / (duration * self.fps)
-            #self.zoom_step = 1 / (duration * self.fps)
+            self.start_zooming(duration, targetZoom)
 
     # zooms out the zoom value of the Shrinker
     # duration is the time in seconds to zoom out
-    # fps is the frames per second of the game
     # startZoom is the zoom value to start the zoom out from
     # if startZoom is -1, the current zoom value is used
     # targetZoom is the zoom value to zoom out to
@@ -52,10 +54,13 @@ class Zoomer:
             self.zoom_out_started = True
             if startZoom != -1:
                 self.zoom = startZoom
-            self.target_zoom = targetZoom
-            self.zoom_step = -(abs(self.target_zoom - self.zoom)) / (duration * self.fps)
-            temp=0
+            self.start_zooming(duration, targetZoom)
 
+    def start_zooming(self, duration, targetZoom):
+        self.start_zoom = self.zoom
+        self.target_zoom = targetZoom
+        self.duration = duration
+        self.start_time = GameClock.now()
 
 
     def is_zooming(self):
@@ -65,17 +70,22 @@ class Zoomer:
     def get_next_zoom(self):
 
         if self.is_zooming():
-            self.zoom += self.zoom_step
-            self.zoom = max(0, min(100, self.zoom))
+            GameClock.mark_animating()
+            progress = GameClock.progress(self.start_time, self.duration)
+            zoom = self.start_zoom + (self.target_zoom - self.start_zoom) * progress
+            self.zoom = max(0, min(100, zoom))
 
-            if self.zoom_in_started and self.zoom >= self.target_zoom:
-                self.zoom_in_ended = True
-            if self.zoom_out_started and self.zoom <= self.target_zoom:
-                self.zoom_out_ended = True
+            if progress >= 1:
+                if self.zoom_in_started:
+                    self.zoom_in_ended = True
+                if self.zoom_out_started:
+                    self.zoom_out_ended = True
 
         return self.zoom
 
 
+    # sets the zoom value and holds it for the rest of a running zoom
     def set_zoom(self, zoom):
         self.zoom = zoom
-        self.zoom_step = 0
\ No newline at end of file
+        self.start_zoom = zoom
+        self.target_zoom = zoom
@@ -8,3 +8,21 @@ from .Utils import Utils
 from .Zoomer import Zoomer
 from .RoundedRect import RoundedRect
 from .Color import Color
+from .DirtyRects import DirtyRects, DirtyTracker
+from .GameClock import GameClock
+from .LazyScreen import LazyScreen
+from .StartupReport import StartupReport
+from .AssetPreloader import AssetPreloader
+from .InputFilter import InputFilter
+from .SurfaceCache import SurfaceCache
+from .AssetRegistry import AssetRegistry
+from .TextCache import TextCache
+from .FontCache import FontCache
+from .RenderQueue import RenderQueue
+from .StaticLayer import StaticLayer
+from .Allocations import Allocations
+from .SoundBank import SoundBank
+from .WidgetManager import WidgetManager
+from .SoundCache import SoundCache
+from .AVSyncMonitor import AVSyncMonitor
+from .Timeline import Timeline
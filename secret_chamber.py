@@ -13,7 +13,7 @@ import pygame
 import random
 
 # game libraries
-from pygame_lib import Button, Utils, TextLine, ScreenFader, Color
+from pygame_lib import Button, Utils, TextLine, ScreenFader, Color, DirtyTracker, RenderQueue, WidgetManager
 
 
 class SecretChamber:
@@ -21,15 +21,19 @@ class SecretChamber:
 
         self.settings = settings
         self.window = pygame.display.get_surface()
+        self.target_fps = settings.secret_chamber_fps
         self.game_exit = False
         self.default_font_path = self.settings.get_fontPath(settings.default_font)
         self.background_img = None
         self.heading = None
+        self.dirty = DirtyTracker()
         button_y = self.window.get_height() - (40 * self.settings.screen_scale_y)
         button_x = self.window.get_width() - (80 * self.settings.screen_scale_x)
         width = 140 * self.settings.screen_scale_x
 
         self.menu_button = self.create_menu_button("Continue", button_x , button_y, width)
+        self.widgets = WidgetManager()
+        self.widgets.add(self.menu_button, self.menu_button.button_area, self.continue_clicked)
 
         # gets assigned in launch.py before the game loop starts
         self.game_play = None
@@ -43,6 +47,10 @@ class SecretChamber:
 
 
 
+    def continue_clicked(self):
+        self.settings.difficulty = 0
+        self.screen_fader.fade_out()
+
     def create_menu_button(self, text, x, y, width):
         if self.settings.sound_fx_on:
             hover_sound = self.settings.get_soundPath(self.settings.menu_hover_sound)
@@ -63,6 +71,9 @@ class SecretChamber:
 
 
     def update(self, events):
+        # hover and button clicks
+        self.widgets.update(events)
+
         for event in events:
             if event.type == pygame.KEYDOWN:
                 # exit game
@@ -71,18 +82,12 @@ class SecretChamber:
                     self.screen_fader.fade_out()
                     break
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # check if the buttons are clicked
-                if self.menu_button.is_clicked(event.pos):
-                    self.settings.difficulty = 0
-                    self.screen_fader.fade_out()
-
 
 
         # fade-in first thing
         if not self.screen_fader.fade_in_started:
             self.screen_fader.fade_in()
-            backgroundPath = Utils.get_random_file_from_path(self.settings.get_imagePath("chamber/"+str(self.settings.difficulty)),True)
+            backgroundPath = self.settings.get_imagePath(Utils.get_random_file_from_path(self.settings.get_imagePath("chamber/"+str(self.settings.difficulty)),True))
             self.background_img = Utils.load_image_to_fixed_height(backgroundPath, self.window.get_height() * 380 // 480, True)
             heading_text = self.settings.win_text[self.settings.difficulty][random.randint(0,2)]
             self.heading = TextLine(self.window, heading_text, Color.WHITE, self.default_font_path, 30 * self.settings.screen_scale_x , self.settings.fps, 2)
@@ -102,9 +107,11 @@ class SecretChamber:
     def draw(self):
 
         # draw image centered on screen
-        self.window.blit(self.background_img,
+        rect = RenderQueue.submit(self.window, self.background_img,
                         (self.window.get_width() // 2 - self.background_img.get_width() // 2,
-                        self.window.get_height() // 2 - self.background_img.get_height() // 2 + 20))
+                        self.window.get_height() // 2 - self.background_img.get_height() // 2 + 20),
+                        RenderQueue.LAYER_BACKGROUND)
+        self.dirty.update(rect, id(self.background_img))
 
         # draw the text lines on the screen
         # and increment the y with each line by the height of the text line
@@ -115,7 +122,4 @@ class SecretChamber:
 
         self.menu_button.draw()
 
-        screen = pygame.display.get_surface()
-        screen.blit(self.window, (0,0))
-
         self.screen_fader.draw()
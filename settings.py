@@ -8,8 +8,11 @@ return the full path to images, fonts, and sounds based on the directory the gam
 """
 
 import os
+import json
 from pygame import mixer
 
+from pygame_lib import SoundBank
+
 class Settings:
 
     # game settings - change as needed
@@ -20,7 +23,48 @@ class Settings:
 
     num_tiles_x = 3
     num_tiles_y = 3
+
+    # frame rates
+    # fps is the full frame rate, each game screen can run at its own rate
     fps = 60
+    splash_fps = 30
+    main_menu_fps = 60
+    game_play_fps = 60
+    secret_chamber_fps = 30
+
+    # drop to idle_fps when there is no input and nothing fades, zooms or pulses
+    # for idle_delay seconds. Any input returns to the full rate at once.
+    # idle_fps of 0 turns idle throttling off
+    idle_fps = 15
+    idle_delay = 1.0
+
+    # game time runs time_scale times as fast as real time, for demos and soak tests
+    # (simulate.py runs the game on virtual time instead)
+    time_scale = 1.0
+
+    # game screens are built the first time they are needed
+    # preload_screens builds the remaining screens one per frame while the splash is showing
+    preload_screens = True
+    show_load_times = False     # print how long each game screen took to build
+
+    # progressive startup shows the splash screen first and decodes images, sounds
+    # and fonts on background threads while the splash screen is showing
+    progressive_startup = True
+    preload_workers = 2
+    startup_budget_ms = 300     # target time from process start to the first splash frame
+    show_startup_report = False # print where the startup time went
+
+    # scaled images are cached on disk so the next start skips decoding and scaling
+    surface_cache_on = True
+    surface_cache_max_mb = 256
+
+    # loaded images are shared in memory, the least recently used ones are
+    # dropped when they need more than this (0 = no limit)
+    asset_registry_max_mb = 128
+
+    # only update the areas of the screen that changed instead of the whole screen
+    # helps on large screens, full screen updates are still used while fading
+    dirty_rect_mode = False
 
 
     # folders
@@ -33,6 +77,12 @@ class Settings:
     font_dir = os.path.join(app_dir, "fonts")
     sound_dir = os.path.join(app_dir, "sounds")
 
+    # cache folder for files created by the game, safe to delete
+    cache_dir = os.path.join(app_dir, "cache")
+
+    # images optimized for each screen size by build_assets.py
+    built_image_dir = os.path.join(image_dir, "built")
+
 
     # game text
     #-----------------------------------------
@@ -81,20 +131,34 @@ class Settings:
     rumbling_sound = "rumble3.ogg"
     temple_chant = "deep_voice_chant2.ogg"
     secret_chamber_sound = "deep_voice_chant2.ogg"
+    sound_channels = 8                  # channels reserved for the sound effects
+    sound_cache_on = True               # keep decoded sound effects in cache_dir for the next start
+    sound_cache_max_mb = 64
+
+    # mixer setup, used before pygame starts
+    # a smaller buffer means less lag between a tile pulse and its sound,
+    # but too small makes the sound crackle on slow devices (try 256 - 1024 on a Pi)
+    mixer_frequency = 44100
+    mixer_size = -16                    # 16 bit signed samples
+    mixer_channels = 2                  # stereo
+    mixer_buffer = 512                  # samples per buffer
+    av_sync_log = False                 # print the offset between each tile pulse and its sound
 
 
     # internal game variables - don't change
     #-----------------------------------------
     difficulty = 0                  # default setting, 0=easy, 1=medium, 2=hard
     score = 0
+    next_game_background = None     # picked in advance so it can be preloaded
     background_music_available = False
     background_music_playing = False
     game_background = None
     supported_extensions = [".ogg", ".mp3", ".wav"]
     game_exit = False
 
-    # table for sound files and sound objects
-    loaded_sounds = {}
+    # built images for the current screen size, read from the manifest on first use
+    built_images = None
+    built_images_size = None
 
     # small, medium, large boards for different screen sizes
     patternboards = ["patternboard_440.png","patternboard_1000.png","patternboard_1680.png"]
@@ -110,8 +174,53 @@ class Settings:
     # application wide helper functions using above settings
     #-----------------------------------------
 
+    # returns the image built for this screen size by build_assets.py if there is one
+    # imageName can also be a full path, e.g. from Utils.get_random_file_from_path
     def get_imagePath(self,imageName):
-        return os.path.join(self.image_dir, imageName)
+        path = os.path.join(self.image_dir, imageName)
+
+        name = os.path.relpath(path, self.image_dir).replace(os.sep, "/")
+        entry = self.get_built_images().get(name)
+        if entry is None:
+            return path
+
+        # use the source if it was changed after the build
+        built_path = os.path.join(self.image_dir, *entry["file"].split("/"))
+        try:
+            if os.stat(path).st_mtime_ns != entry["source_mtime_ns"] or not os.path.exists(built_path):
+                return path
+        except OSError:
+            return path
+        return built_path
+
+    # the smallest built image set that covers the screen, the source images are
+    # used if the screen is larger than all of them
+    def get_built_images(self):
+        if self.built_images is not None and self.built_images_size == self.screen_size:
+            return self.built_images
+
+        Settings.built_images = {}
+        Settings.built_images_size = self.screen_size
+        try:
+            with open(os.path.join(self.built_image_dir, "manifest.json")) as manifest_file:
+                variants = json.load(manifest_file)["variants"]
+        except (OSError, ValueError, KeyError):
+            return self.built_images
+
+        sizes = sorted((tuple(int(value) for value in resolution.split("x")), resolution)
+                       for resolution in variants if variants[resolution])
+        width, height = self.screen_size
+        for (built_width, built_height), resolution in sizes:
+            if built_width >= width and built_height >= height:
+                Settings.built_images = variants[resolution]
+                break
+        return self.built_images
+
+    # small, medium or large pattern board for the board height in pixels
+    def get_patternboard(self, board_height):
+        if board_height <= 480:     return self.patternboards[0]
+        elif board_height <= 1200:  return self.patternboards[1]
+        else:                       return self.patternboards[2]
 
     def get_fontPath(self, fontName):
         return os.path.join(self.font_dir, fontName+".ttf")
@@ -122,6 +231,15 @@ class Settings:
             raise ValueError("Sound file must have extension " + ", ".join(self.supported_extensions))
         return os.path.join(self.sound_dir, soundFile)
 
+    # all sound effects, they are decoded at startup
+    def get_sound_paths(self):
+        sound_files = self.tile_pulse_sounds + [self.menu_hover_sound,
+                                                self.tile_selector_sound,
+                                                self.rumbling_sound,
+                                                self.temple_chant,
+                                                self.secret_chamber_sound]
+        return [self.get_soundPath(sound_file) for sound_file in sound_files]
+
 
     def background_music(self, status, volume=-1, loop=False):
         if not self.background_music_available or not self.background_music_on:
@@ -149,14 +267,9 @@ class Settings:
                 self.background_music_playing = True
 
 
-    def play_sound(self, sound_file_name):
+    # returns the channel the sound plays on, None if it didn't play
+    def play_sound(self, sound_file_name, priority=SoundBank.PRIORITY_NORMAL):
         if not self.sound_fx_on:
-            return
-        # if sound_file_name not loaded before, load and add to table
-        if sound_file_name not in self.loaded_sounds:
-            sound = mixer.Sound(self.get_soundPath(sound_file_name))
-            self.loaded_sounds[sound_file_name] = sound
-        else:
-            sound = self.loaded_sounds[sound_file_name]
-
-        mixer.find_channel().play(sound)
+            return None
+        # sounds are loaded once and shared with the buttons
+        return SoundBank.play(self.get_soundPath(sound_file_name), priority)
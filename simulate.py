@@ -0,0 +1,145 @@
+"""
+Simulate
+--------
+Plays the game headless (SDL dummy video and audio drivers) on virtual time.
+A scripted player waits for the splash screen, picks a difficulty in the main
+menu, repeats the computer's sequence until the secret chamber opens and goes
+back to the main menu, as many times as asked. Then it exits from the main menu.
+
+The game clock moves a fixed step per frame instead of following the real
+time, so all waits, fades and pulses take their normal game time but the run
+only takes as long as drawing the frames. Use it for quick end to end checks,
+benchmarks of a whole game and soak tests.
+
+Usage:
+    python simulate.py
+    python simulate.py --games 20 --step-ms 50 --resolution 1280x720 --difficulty 2
+
+"""
+# system libraries
+import os
+import sys
+import time
+import argparse
+
+# use the dummy drivers so no window or sound device is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+# settings shared by all game screens
+from settings import Settings
+from game_loop import GameLoop
+from game_play import GameState
+from pygame_lib import GameClock
+
+
+class ScriptedPlayer:
+    def __init__(self, games, difficulty):
+        self.games = games
+        self.difficulty = difficulty
+        self.games_played = 0
+        self.clicked = False
+
+    # a new screen was shown
+    def screen_changed(self, screen):
+        self.clicked = False
+        if type(screen).__name__ == "SecretChamber":
+            self.games_played += 1
+
+    def click(self, pos):
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)]
+
+    def get_events(self, screen):
+        match type(screen).__name__:
+            case "MainMenu":
+                return self.main_menu(screen)
+            case "GamePlay":
+                return self.game_play(screen)
+            case "SecretChamber":
+                return self.secret_chamber(screen)
+        # the splash screen runs until it is done
+        return []
+
+    def main_menu(self, menu):
+        if self.clicked or not menu.screen_fader.fade_in_completed:
+            return []
+        self.clicked = True
+        if self.games_played >= self.games:
+            return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode="")]
+        button = [menu.easy_button, menu.medium_button, menu.hard_button][self.difficulty]
+        return self.click(button.button_area.center)
+
+    def game_play(self, game_play):
+        # one tile per frame, in the order the computer pulsed them
+        if game_play.game_state != GameState.PLAYER_TURN or not game_play.player_sequence_started:
+            return []
+        index = len(game_play.player_sequence)
+        if index >= len(game_play.computer_sequence):
+            return []
+        board = game_play.game_board
+        x, y = board.get_coords_from_tile_number(game_play.computer_sequence[index])
+        return self.click((board.board_x + x + 5, board.board_y + y + 5))
+
+    def secret_chamber(self, chamber):
+        if self.clicked or not chamber.screen_fader.fade_in_completed:
+            return []
+        self.clicked = True
+        return self.click(chamber.menu_button.button_area.center)
+
+
+def simulate(games, step_ms, resolution, difficulty, max_frames):
+    width, height = (int(value) for value in resolution.lower().split("x"))
+    Settings.screen_mode = "window"
+    Settings.screen_size = (width, height)
+    # load the splash image right away instead of in the background
+    Settings.progressive_startup = False
+
+    game = GameLoop()
+    player = ScriptedPlayer(games, difficulty)
+
+    # time only moves by step_ms per frame
+    GameClock.configure(virtual=True)
+    GameClock.tick()
+    game_start = GameClock.get_time()
+    real_start = time.perf_counter()
+
+    def report(frames, name):
+        print(f"frame {frames:6}  game {(GameClock.now() - game_start) / 1000:8.2f} s  "
+              f"real {time.perf_counter() - real_start:7.2f} s  {name}")
+        sys.stdout.flush()
+
+    frames = 0
+    report(frames, type(game.current_screen).__name__)
+    while frames < max_frames:
+        # same frame as the game loop, with scripted input
+        GameClock.advance(step_ms)
+        frames += 1
+
+        screen = game.current_screen
+        if not game.run_frame(player.get_events(screen)):
+            break
+        if game.current_screen != screen:
+            player.screen_changed(game.current_screen)
+            report(frames, type(game.current_screen).__name__)
+
+    report(frames, "done" if frames < max_frames else "stopped, too many frames")
+    game_time = (GameClock.now() - game_start) / 1000
+    real_time = time.perf_counter() - real_start
+    print(f"{player.games_played} games, {frames} frames, {game_time:.1f} s game time in {real_time:.2f} s "
+          f"({game_time / max(real_time, 0.001):.0f}x)")
+    pygame.quit()
+    return player.games_played
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless scripted game on virtual time")
+    parser.add_argument("--games", type=int, default=1, help="games played to the secret chamber")
+    parser.add_argument("--step-ms", type=float, default=50, help="game time per frame in ms")
+    parser.add_argument("--resolution", default="800x480", help="WIDTHxHEIGHT")
+    parser.add_argument("--difficulty", type=int, default=0, choices=[0, 1, 2])
+    parser.add_argument("--max-frames", type=int, default=100000, help="stop if the game gets stuck")
+    args = parser.parse_args()
+
+    simulate(args.games, args.step_ms, args.resolution, args.difficulty, args.max_frames)
@@ -7,19 +7,37 @@ the a key or clicking the mouse.
 """
 import pygame
 from pygame.locals import *
-from pygame_lib import Utils, TextLine, ScreenFader, Timer, Color
+from pygame_lib import Utils, TextLine, ScreenFader, Timer, Color, DirtyTracker, AssetPreloader, StartupReport, RenderQueue
 
 
 class SplashPage:
     def __init__(self, settings):
         self.settings = settings
         self.screen = pygame.display.get_surface()
+        self.target_fps = settings.splash_fps
         self.screen_fader = ScreenFader(settings.fps)
         self.timer = Timer()
 
         # load random background image and scale to screen width
-        imageFile = Utils.get_random_file_from_path(settings.get_imagePath("splash"),True)
-        self.splash_image = Utils.load_image_to_fixed_width(imageFile, self.screen.get_width())
+        # with progressive startup the image is decoded in the background and the
+        # screen stays black until it is ready, unless it is in the disk cache
+        self.splash_image_file = settings.get_imagePath(Utils.get_random_file_from_path(settings.get_imagePath("splash"),True))
+        self.splash_image = None
+        if settings.progressive_startup and \
+           not Utils.is_scaled_image_cached(self.splash_image_file, self.screen.get_width(), 0):
+            AssetPreloader.request_image(self.splash_image_file)
+        else:
+            self.load_splash_image()
+        self.dirty = DirtyTracker()
+
+        # plain title on black, shown while the splash image is still loading
+        # so the first frame is never just black
+        self.loading_text = TextLine(self.screen, settings.game_title, Color.WHITE,
+                                     self.settings.get_fontPath(self.settings.default_font), 50 * self.settings.screen_scale_x, settings.fps)
+
+        # set by draw once the screen shows something, the game loop waits for it
+        # before it marks the first frame
+        self.has_content = False
 
         # create text image for game title
         self.title_text = TextLine(self.screen, settings.game_title,
@@ -33,6 +51,13 @@ class SplashPage:
         self.main_menu = None
 
 
+    def load_splash_image(self):
+        self.splash_image = Utils.load_image_to_fixed_width(self.splash_image_file, self.screen.get_width())
+        StartupReport.mark("splash image ready")
+        # splash image is shown for a fixed time from when it is ready
+        self.timer.restart()
+
+
     # update method determines and returns the next game screen
     # based on the events that have occurred
     # it will either return itself or the next game screen
@@ -52,6 +77,12 @@ class SplashPage:
                 self.settings.background_music("unpause")
                 return self.main_menu
 
+        # wait for the splash image before starting the fade-in
+        if self.splash_image is None:
+            if not AssetPreloader.is_ready(self.splash_image_file):
+                return self
+            self.load_splash_image()
+
         # first thing - fade-in and play temple chant
         if not self.screen_fader.fade_in_started:
             self.screen_fader.fade_in(2)
@@ -87,8 +118,16 @@ class SplashPage:
 
     def draw(self):
 
+        # show the plain title until the splash image is ready, the image fades in after that
+        if self.splash_image is None:
+            self.loading_text.draw(-1,-1)
+            self.has_content = True
+            return
+
         # draw background
-        self.screen.blit(self.splash_image, (0,0))
+        rect = RenderQueue.submit(self.screen, self.splash_image, (0,0), RenderQueue.LAYER_BACKGROUND)
+        self.dirty.update(rect)
+        self.has_content = True
         #self.screen.blit(self.splash_pan_image, (0,0), self.viewFrame_rect)
 
         # draw game title
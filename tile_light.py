@@ -9,7 +9,7 @@ displays it as a cursor and is used when the player moves around the board to se
 """
 
 import pygame
-from pygame_lib import Fader
+from pygame_lib import Fader, DirtyTracker, RenderQueue, Allocations, GameClock
 
 
 # tile lights can have 3 configurations
@@ -17,6 +17,11 @@ from pygame_lib import Fader
 # 2. pulsing - tile is pulsing on and off
 # 3. border  - only the border of the tile is on (used for selecting a tile)
 class TileLight:
+    # shared surfaces, see get_fill_frame and get_selector_surface
+    fill_frames = {}
+    selector_surfaces = {}
+    alpha_step = 8
+
     def __init__(self, screen, x, y, width, height, fps):
         self.screen=screen
         self.width = width
@@ -28,107 +33,140 @@ class TileLight:
         self.pulse_ended = False
         self.is_pulsing = False
         self.tile_pulse_duration = 0
+        self.pulse_start_time = None
         self.isOn = False
         self.selectorOn = False
 
-        self.tile_surface = pygame.Surface((self.width, self.height))
-        self.tile_surface.fill((255,255,255))
-
-        self.selector_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA )
-        self.draw_tile_selector()
+        # surfaces are shared by all tile lights of the same size
+        self.border_width = 8 * self.screen.get_width() // 800
+        self.selector_surface = TileLight.get_selector_surface(self.width, self.height, self.border_width)
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
         self.fader = Fader(fps)
-        self.surface_to_use = self.tile_surface
+        self.surface_to_use = None
         self.fader.alpha = 0
+        self.dirty = DirtyTracker()
 
 
-
-    def draw_tile_selector(self):
-
-        border_width = 8 * self.screen.get_width() // 800
+    # gets the tile light ready for a new round without creating it again
+    def reset(self):
+        self.pulse_started = False
+        self.pulse_ended = False
+        self.is_pulsing = False
+        self.isOn = False
+        self.selectorOn = False
+        self.fader.reset(0)
+
+
+    # white tile with the alpha already set, alpha is rounded to alpha_step
+    # so a pulse only uses a few surfaces that are created once
+    @staticmethod
+    def get_fill_frame(width, height, alpha):
+        alpha = min(255, round(alpha / TileLight.alpha_step) * TileLight.alpha_step)
+        key = (width, height, alpha)
+        frame = TileLight.fill_frames.get(key)
+        if frame is None:
+            frame = pygame.Surface((width, height))
+            frame.fill((255,255,255))
+            frame.set_alpha(alpha)
+            Allocations.add("TileLight")
+            TileLight.fill_frames[key] = frame
+        return frame
+
+    @staticmethod
+    def get_selector_surface(width, height, border_width):
+        key = (width, height, border_width)
+        surface = TileLight.selector_surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            TileLight.draw_tile_selector(surface, border_width)
+            Allocations.add("TileLight")
+            TileLight.selector_surfaces[key] = surface
+        return surface
+
+
+    @staticmethod
+    def draw_tile_selector(surface, border_width):
 
         # Draw the frame as a rectangle with a transparent middle
         frame_color = (255, 255, 255, 255)  # White color with 0 transparency
-        frame_rect = self.selector_surface.get_rect()
+        frame_rect = surface.get_rect()
         # shrink by 10
         frame_rect.inflate_ip(-5 * 2, -5 * 2)
-        frame_rect.center = self.tile_surface.get_rect().center
-        pygame.draw.rect(self.selector_surface, frame_color, frame_rect)
+        frame_rect.center = surface.get_rect().center
+        pygame.draw.rect(surface, frame_color, frame_rect)
 
         inner_rect = frame_rect.inflate(-border_width * 2, -border_width * 2)
-        pygame.draw.rect(self.selector_surface, (0, 0, 0, 0), inner_rect)
+        pygame.draw.rect(surface, (0, 0, 0, 0), inner_rect)
 
         # draw a transparent horizontal bar in the middle
         cross_rect = frame_rect.copy()
-        cross_rect.center = self.tile_surface.get_rect().center
+        cross_rect.center = surface.get_rect().center
         cross_rect.height = frame_rect.height // 2
         cross_rect.y = (frame_rect.height - cross_rect.height) // 2 + border_width
 
-        pygame.draw.rect(self.selector_surface, (0, 0, 0, 0), cross_rect)
+        pygame.draw.rect(surface, (0, 0, 0, 0), cross_rect)
 
         # draw a transparent vertical bar in the middle
         cross_rect = frame_rect.copy()
-        cross_rect.center = self.tile_surface.get_rect().center
+        cross_rect.center = surface.get_rect().center
         cross_rect.width = frame_rect.width // 2
         cross_rect.x = (frame_rect.width - cross_rect.width) // 2 + border_width
-        pygame.draw.rect(self.selector_surface, (0, 0, 0, 0), cross_rect)
+        pygame.draw.rect(surface, (0, 0, 0, 0), cross_rect)
 
     def selector_on (self):
         self.selectorOn = True
         self.fader.set_alpha(200)
-        self.surface_to_use = self.selector_surface
 
     def selector_off (self):
         self.selectorOn = False
         self.fader.set_alpha(0)
-        self.surface_to_use = self.tile_surface
 
     def turn_on(self):
         self.isOn = True
         self.isPulsing = self.selectorOn = False
         self.fader.set_alpha(200)
-        self.surface_to_use = self.tile_surface
 
     def turn_off(self):
         self.isOn = False
         self.fader.set_alpha(0)
-        self.surface_to_use = self.tile_surface
 
-    def pulse(self, duration=0.4):
+    # fades in for duration seconds, then out for duration seconds
+    # start_time is the GameClock time the pulse was scheduled for, now if it is None
+    def pulse(self, duration=0.4, start_time=None):
         if not self.pulse_started:
             self.tile_pulse_duration = duration
+            self.pulse_start_time = GameClock.now() if start_time is None else start_time
             self.pulse_started = True
             self.pulse_ended = False
             self.is_pulsing = True
-            self.surface_to_use = self.tile_surface
-            self.fader.fade_in(self.tile_pulse_duration,0,170)
+            self.fader.fade_in(self.tile_pulse_duration,0,170,self.pulse_start_time)
 
 
     def draw (self):
 
-        self.surface_to_use = self.tile_surface
-
         if (self.pulse_started and not self.pulse_ended):
-            alpha = self.fader.get_next_alpha()
-
+            self.surface_to_use = TileLight.get_fill_frame(self.width, self.height, self.fader.get_next_alpha())
         elif (self.isOn):
-            alpha = 200
-            self.surface_to_use = self.tile_surface
+            self.surface_to_use = TileLight.get_fill_frame(self.width, self.height, 200)
         elif (self.selectorOn):
-            alpha = 255
             self.surface_to_use = self.selector_surface
         else:
-            alpha = 0
-
-
+            self.surface_to_use = None
 
-        self.surface_to_use.set_alpha(alpha)
+        alpha = 0 if self.surface_to_use is None else self.surface_to_use.get_alpha()
 
-        self.screen.blit(self.surface_to_use, (self.x, self.y))
+        # nothing to draw for a tile that is off
+        if self.surface_to_use is not None and alpha > 0:
+            RenderQueue.submit(self.screen, self.surface_to_use, self.rect, RenderQueue.LAYER_SCENE)
+        self.dirty.update(self.rect, (alpha, self.surface_to_use is self.selector_surface))
 
         if self.is_pulsing:
+            # the fade out starts right when the fade in should have ended,
+            # even if this frame came late
             if self.fader.fade_in_ended and not self.fader.fade_out_started:
-                self.fader.fade_out(self.tile_pulse_duration,170,0)
+                self.fader.fade_out(self.tile_pulse_duration,170,0,
+                                    self.pulse_start_time + self.tile_pulse_duration * 1000)
 
             if self.fader.fade_out_ended:
                 self.pulse_ended = True